@@ -0,0 +1,41 @@
+"""Micro-benchmark of creating the AES decryptor for an encrypted map frame.
+
+Compares deriving the key and building the cipher for every frame with the cached
+cipher of DreameVacuumMapDecoder._get_cipher. Requires the integration requirements
+from manifest.json to be installed.
+
+    python benchmarks/map_cipher.py [iterations]
+"""
+
+import hashlib
+import os
+import sys
+import timeit
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components", "dreame_vacuum"))
+
+from dreame.map import DreameVacuumMapDecoder  # noqa: E402
+
+KEY = "k" * 24
+AES_IV = "abcdefghijklmnop"
+
+
+def uncached_decryptor():
+    # Per frame key derivation and cipher creation of the decoder before the cipher was cached
+    key = hashlib.sha256(KEY.encode()).hexdigest()[0:32].encode("utf8")
+    return Cipher(algorithms.AES(key), modes.CBC(AES_IV.encode("utf8")), backend=default_backend()).decryptor()
+
+
+def cached_decryptor():
+    return DreameVacuumMapDecoder._get_cipher(KEY, AES_IV).decryptor()
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, function in (("before", uncached_decryptor), ("after", cached_decryptor)):
+        function()
+        elapsed = timeit.timeit(function, number=iterations)
+        print(f"{name}: {elapsed / iterations * 1e6:.1f} us per frame")
@@ -0,0 +1,120 @@
+"""Render time benchmark of the map image renderer.
+
+Measures the first render_map of generated room maps, which builds the base image layer from
+the pixel types, and the following live frames where only the robot moves and the path is
+appended, which recomposite the changed object areas. Without arguments the renderer of the
+working tree is measured, git revisions can be given to compare the renderer of other versions.
+Requires the integration requirements from manifest.json to be installed.
+
+    python benchmarks/map_render.py [revision ...]
+"""
+
+import base64
+import copy
+import importlib
+import json
+import logging
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_PATH = os.path.join("custom_components", "dreame_vacuum", "dreame")
+MAPS = [(300, 300, 8), (600, 600, 25), (1000, 800, 40)]
+LIVE_FRAMES = 20
+
+
+def load_map_module(index: int, revision: str = None):
+    directory = tempfile.mkdtemp()
+    name = f"dreame_benchmark_{index}"
+    package = os.path.join(directory, name)
+    shutil.copytree(os.path.join(ROOT, PACKAGE_PATH), package, ignore=shutil.ignore_patterns("__pycache__"))
+    if revision:
+        # Files of the revision replace the working tree files, the others are used as they are
+        archive = subprocess.run(
+            ["git", "archive", revision, PACKAGE_PATH.replace(os.sep, "/")], cwd=ROOT, check=True, capture_output=True
+        ).stdout
+        subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+        shutil.copytree(os.path.join(directory, PACKAGE_PATH), package, dirs_exist_ok=True)
+
+    # Package is imported without its __init__ that needs the device dependencies
+    with open(os.path.join(package, "__init__.py"), "w", encoding="utf-8"):
+        pass
+    sys.path.insert(0, directory)
+    return importlib.import_module(f"{name}.map")
+
+
+def make_frame(frame_id, frame_type, width, height, left, top, robot, pixels, data_json) -> str:
+    header = struct.pack("<hhb", 1, frame_id, frame_type)
+    header += struct.pack("<hhh", *robot) + struct.pack("<hhh", 0, 0, 90)
+    header += struct.pack("<hhhhh", 50, width, height, left, top)
+    raw = header + bytes(pixels) + json.dumps(data_json).encode()
+    return base64.urlsafe_b64encode(zlib.compress(raw)).decode()
+
+
+def room_pixels(width: int, height: int, rooms: int, seed: int) -> bytes:
+    rnd = random.Random(seed)
+    pixels = np.zeros((height, width), np.uint8)
+    for room in range(1, rooms + 1):
+        x0, y0 = rnd.randrange(0, width - 5), rnd.randrange(0, height - 5)
+        x1, y1 = min(width, x0 + rnd.randrange(4, width // 2)), min(height, y0 + rnd.randrange(4, height // 2))
+        pixels[y0:y1, x0:x1] = room
+        pixels[y0, x0:x1] = 0x80 | room
+    return pixels.tobytes()
+
+
+def snapshot(map_data):
+    return map_data.snapshot() if hasattr(map_data, "snapshot") else copy.deepcopy(map_data)
+
+
+def benchmark(module, width: int, height: int, rooms: int, seed: int) -> tuple[float, float]:
+    decoder = module.DreameVacuumMapDecoder
+    left, top = -width * 25, -height * 25
+    map_data = decoder.decode_map(
+        make_frame(1, 73, width, height, left, top, (0, 0, 0), room_pixels(width, height, rooms, seed), {"tr": "M0,0L100,100"}),
+        False,
+    )[0]
+    map_data.saved_map = False
+
+    renderer = module.DreameVacuumMapRenderer()
+    start = time.perf_counter()
+    renderer.render_map(snapshot(map_data), 1)
+    first_frame = time.perf_counter() - start
+
+    rnd = random.Random(seed)
+    x, y = 100, 100
+    live_frames = 0
+    for frame_id in range(2, LIVE_FRAMES + 2):
+        points = []
+        for _ in range(3):
+            x = max(min(x + rnd.randrange(-150, 150), width * 20), -width * 20)
+            y = max(min(y + rnd.randrange(-150, 150), height * 20), -height * 20)
+            points.append(f"L{x},{y}")
+        partial_map = decoder.decode_map_partial(
+            make_frame(frame_id, 80, 0, 0, left, top, (x, y, rnd.randrange(0, 360)), b"", {"tr": "".join(points)})
+        )
+        map_data = decoder.decode_p_map_data_from_partial(partial_map, map_data, False)
+        start = time.perf_counter()
+        renderer.render_map(snapshot(map_data), 1)
+        live_frames = live_frames + time.perf_counter() - start
+    return first_frame * 1000, live_frames / LIVE_FRAMES * 1000
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    for index, revision in enumerate(sys.argv[1:] or [None]):
+        module = load_map_module(index, revision)
+        for seed, (width, height, rooms) in enumerate(MAPS):
+            first_frame, live_frame = benchmark(module, width, height, rooms, seed)
+            print(
+                f"{revision or 'working tree'} {width}x{height}: "
+                f"first frame {first_frame:.0f} ms, live frame {live_frame:.1f} ms"
+            )
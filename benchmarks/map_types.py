@@ -0,0 +1,108 @@
+"""Memory and deep copy benchmark of the map geometry types.
+
+Builds a map with 25 segments, 200 obstacles, 20 areas, 20 walls and a 30000 point path and
+measures its memory and copy.deepcopy time, and the same for 30000 Path objects. Without
+arguments the types of the working tree are measured, git revisions can be given to compare
+the types.py of other versions, for example the version before the types were slotted.
+
+    python benchmarks/map_types.py [revision ...]
+"""
+
+import copy
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TYPES_PATH = os.path.join("custom_components", "dreame_vacuum", "dreame", "types.py")
+
+
+def load_types(revision: str = None):
+    name = f"map_types_{revision or 'working_tree'}".replace("~", "_").replace("^", "_")
+    path = os.path.join(ROOT, TYPES_PATH)
+    if revision:
+        source = subprocess.run(
+            ["git", "show", f"{revision}:{TYPES_PATH}"], cwd=ROOT, check=True, capture_output=True
+        ).stdout
+        path = os.path.join(tempfile.mkdtemp(), "types.py")
+        with open(path, "wb") as file:
+            file.write(source)
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_map(types):
+    rnd = random.Random(1)
+    map_data = types.MapData()
+    map_data.dimensions = types.MapImageDimensions(-7500, -7500, 300, 300, 50)
+    map_data.segments = {
+        i: types.Segment(
+            i,
+            rnd.randrange(-7000, 0),
+            rnd.randrange(-7000, 0),
+            rnd.randrange(0, 7000),
+            rnd.randrange(0, 7000),
+            10,
+            20,
+            type=rnd.randrange(0, 5),
+            neighbors=list(range(1, rnd.randrange(2, 6))),
+        )
+        for i in range(1, 26)
+    }
+    map_data.obstacles = [
+        types.Obstacle(rnd.randrange(-7000, 7000), rnd.randrange(-7000, 7000), types.ObstacleType.SHOES, 80, i, "f", 1)
+        for i in range(200)
+    ]
+    map_data.no_go_areas = [types.Area(*[rnd.randrange(-7000, 7000) for _ in range(8)]) for _ in range(10)]
+    map_data.no_mopping_areas = [types.Area(*[rnd.randrange(-7000, 7000) for _ in range(8)]) for _ in range(10)]
+    map_data.walls = [types.Wall(*[rnd.randrange(-7000, 7000) for _ in range(4)]) for _ in range(20)]
+    map_data.robot_position = types.Point(1, 2, 45)
+    map_data.charger_position = types.Point(3, 4, 90)
+    map_data.path = types.PathList(np.arange(30000), np.arange(30000), np.full(30000, ord("L"), np.uint8))
+    return map_data
+
+
+def build_path(types):
+    return [types.Path(i, i, types.PathType.LINE) for i in range(30000)]
+
+
+def measure_memory(function, *args) -> float:
+    tracemalloc.start()
+    result = function(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1024
+
+
+def measure_deepcopy(value, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        copy.deepcopy(value)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+if __name__ == "__main__":
+    for revision in sys.argv[1:] or [None]:
+        types = load_types(revision)
+        map_data = build_map(types)
+        path = build_path(types)
+        print(
+            f"{revision or 'working tree'}: "
+            f"map {measure_memory(build_map, types):.0f} KB, "
+            f"deepcopy map {measure_deepcopy(map_data, 20):.2f} ms, "
+            f"deepcopy 25 segments {measure_deepcopy(map_data.segments, 20):.3f} ms, "
+            f"30000 Path objects {measure_memory(build_path, types):.0f} KB, "
+            f"deepcopy {measure_deepcopy(path, 3):.1f} ms"
+        )
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import collections
+import hashlib
+import json
+import os
 import time
 import asyncio
+import multiprocessing
 from typing import Any, Dict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import partial
+from threading import Condition, Lock, Thread
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from aiohttp import web
 
 from homeassistant.components.camera import Camera, CameraEntityDescription
@@ -16,8 +23,9 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.storage import STORAGE_DIR
 
-from .const import DOMAIN, CONF_COLOR_SCHEME, CONF_ICON_SET, CONF_MAP_OBJECTS, MAP_OBJECTS, ATTR_CALIBRATION, CONTENT_TYPE, LOGGER
+from .const import DOMAIN, CONF_COLOR_SCHEME, CONF_ICON_SET, CONF_MAP_OBJECTS, CONF_RENDER_PROCESSES, CONF_RENDER_PROFILE, MAP_OBJECTS, ATTR_CALIBRATION, CONTENT_TYPE, LOGGER
 
 from .coordinator import DreameVacuumDataUpdateCoordinator
 from .entity import DreameVacuumEntity, DreameVacuumEntityDescription
@@ -55,14 +63,21 @@ async def async_setup_entry(
     color_scheme = entry.options.get(CONF_COLOR_SCHEME)
     icon_set = entry.options.get(CONF_ICON_SET)
     map_objects = entry.options.get(CONF_MAP_OBJECTS, MAP_OBJECTS.keys())
+    render_profile = entry.options.get(CONF_RENDER_PROFILE)
+    image_cache = hass.data.get(DreameVacuumMapImageCache.NAME)
+    if image_cache is None:
+        image_cache = DreameVacuumMapImageCache(hass.config.path(STORAGE_DIR, DreameVacuumMapImageCache.NAME))
+        hass.data[DreameVacuumMapImageCache.NAME] = image_cache
+    render_worker = DreameVacuumMapRenderWorker(hass, image_cache, entry.options.get(CONF_RENDER_PROCESSES, False))
+    entry.async_on_unload(render_worker.stop)
     if coordinator.device.status.map_available:
         async_add_entities(
-            DreameVacuumCameraEntity(coordinator, description, color_scheme, icon_set, map_objects)
+            DreameVacuumCameraEntity(coordinator, description, render_worker, color_scheme, icon_set, map_objects, render_profile)
             for description in CAMERAS
         )
 
     update_map_cameras = partial(
-        async_update_map_cameras, coordinator, {}, async_add_entities, color_scheme, icon_set, map_objects
+        async_update_map_cameras, coordinator, {}, async_add_entities, render_worker, color_scheme, icon_set, map_objects, render_profile
     )
     coordinator.async_add_listener(update_map_cameras)
     update_map_cameras()
@@ -73,9 +88,11 @@ def async_update_map_cameras(
     coordinator: DreameVacuumDataUpdateCoordinator,
     current: dict[str, list[DreameVacuumCameraEntity]],
     async_add_entities,
+    render_worker: DreameVacuumMapRenderWorker,
     color_scheme: str,
     icon_set: str,
     map_objects: list[str],
+    render_profile: str,
 ) -> None:
     new_indexes = set(
         [k for k in range(1, len(coordinator.device.status.map_list) + 1)])
@@ -93,9 +110,11 @@ def async_update_map_cameras(
                     entity_category=EntityCategory.CONFIG,
                     icon="mdi:map-search",
                 ),
+                render_worker,
                 color_scheme,
                 icon_set,
                 map_objects,
+                render_profile,
                 map_index,
             )
         ]
@@ -118,6 +137,253 @@ def async_remove_map_cameras(
     del current[map_index]
 
 
+class DreameVacuumMapRenderPool:
+    """Process pool for rendering the saved maps in parallel, shared by the render workers of all devices so the worker count stays capped.
+    Processes are started with spawn because forking the Home Assistant process with its running threads is not safe."""
+
+    MAX_WORKERS = 4
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor = None
+        self._users = 0
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._users = self._users + 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._users = self._users - 1
+            if self._users <= 0 and self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Leave a core for the event loop and the current map renders
+        max_workers = max(1, min(self.MAX_WORKERS, (os.cpu_count() or 1) - 1))
+        return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker process has died, replace the pool once and let the caller handle a pool that keeps breaking
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self._executor = self._create_executor()
+                return self._executor.submit(fn, *args)
+
+
+RENDER_POOL = DreameVacuumMapRenderPool()
+
+
+class DreameVacuumMapImageCache:
+    """Persistent cache of the rendered saved map images under the Home Assistant storage directory, so saved maps are not rendered again after a restart.
+    Images are stored as files with an index that holds their calibration points and last use time, least recently used images are evicted when the total size exceeds the limit.
+    Last use times of the cache hits are only kept in memory and written with the next stored image to avoid a disk write for every hit.
+    Only accessed from the render worker threads, cache errors are logged and never raised."""
+
+    NAME = f"{DOMAIN}_map_images"
+    MAX_SIZE = 50 * 1024 * 1024
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._index: dict[str, dict[str, Any]] = None
+        self._lock = Lock()
+
+    @staticmethod
+    def _valid_entry(entry: Any) -> bool:
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("size"), int)
+            and isinstance(entry.get("used"), (int, float))
+            and "calibration_points" in entry
+        )
+
+    def _load_index(self) -> None:
+        if self._index is None:
+            self._index = {}
+            try:
+                with open(os.path.join(self._path, "index.json"), "r", encoding="utf-8") as file:
+                    index = json.load(file)
+                if isinstance(index, dict):
+                    self._index = {k: v for k, v in index.items() if self._valid_entry(v)}
+                else:
+                    LOGGER.warning("Map image cache index is invalid, cache is cleared")
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as ex:
+                LOGGER.warning("Map image cache index could not be loaded: %s", ex)
+
+            # Remove the images that are not in the index anymore
+            try:
+                for file_name in os.listdir(self._path):
+                    if file_name not in self._index and file_name != "index.json":
+                        os.remove(os.path.join(self._path, file_name))
+            except OSError:
+                pass
+
+    def _save_index(self) -> None:
+        file_path = os.path.join(self._path, "index.json")
+        with open(f"{file_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(self._index, file)
+        os.replace(f"{file_path}.tmp", file_path)
+
+    def get(self, key: str) -> tuple[bytes, Any] | None:
+        with self._lock:
+            try:
+                self._load_index()
+                entry = self._index.get(key)
+                if entry is None:
+                    return None
+                try:
+                    with open(os.path.join(self._path, key), "rb") as file:
+                        image = file.read()
+                except OSError as ex:
+                    # Entry is dropped from the index that is written with the next stored image
+                    LOGGER.debug("Map image cache entry could not be read: %s", ex)
+                    del self._index[key]
+                    return None
+                entry["used"] = time.time()
+                return image, entry["calibration_points"]
+            except Exception as ex:
+                LOGGER.warning("Map image cache could not be read: %s", ex)
+                return None
+
+    def set(self, key: str, image: bytes, calibration_points: Any) -> None:
+        if not image:
+            return
+
+        with self._lock:
+            try:
+                self._load_index()
+                os.makedirs(self._path, exist_ok=True)
+                with open(os.path.join(self._path, key), "wb") as file:
+                    file.write(image)
+                self._index[key] = {"size": len(image), "used": time.time(), "calibration_points": calibration_points}
+
+                size = sum(entry["size"] for entry in self._index.values())
+                for old_key in sorted(self._index, key=lambda k: self._index[k]["used"]):
+                    if size <= self.MAX_SIZE or old_key == key:
+                        break
+                    size = size - self._index.pop(old_key)["size"]
+                    try:
+                        os.remove(os.path.join(self._path, old_key))
+                    except FileNotFoundError:
+                        pass
+                self._save_index()
+            except Exception as ex:
+                LOGGER.warning("Map image could not be cached: %s", ex)
+
+
+class DreameVacuumMapRenderWorker:
+    """Renders the camera images on a dedicated thread so rendering does not block the event loop.
+    Every camera has a single slot for its render request, a camera that is requested again before its turn is rendered only once with the latest map data.
+    Current map cameras are rendered before the saved map cameras.
+    When render processes are enabled saved map cameras are rendered on the shared process pool and the thread only prepares their map data.
+    Saved map images are looked up from the image cache before rendering and stored to it after rendering."""
+
+    def __init__(self, hass: HomeAssistant, image_cache: DreameVacuumMapImageCache, render_processes: bool = False) -> None:
+        self._hass = hass
+        self._image_cache = image_cache
+        self._requests: dict[DreameVacuumCameraEntity, int] = {}
+        self._request_count = 0
+        self._futures: dict[DreameVacuumCameraEntity, Future] = {}
+        self._condition = Condition()
+        self._thread: Thread = None
+        self._running = True
+        self._render_processes = render_processes
+        if render_processes:
+            RENDER_POOL.acquire()
+
+    def request(self, camera: DreameVacuumCameraEntity) -> None:
+        with self._condition:
+            if not self._running:
+                return
+            if camera not in self._requests:
+                self._request_count = self._request_count + 1
+                self._requests[camera] = self._request_count
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=f"{DOMAIN}_map_render", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self, camera: DreameVacuumCameraEntity) -> None:
+        with self._condition:
+            self._requests.pop(camera, None)
+            future = self._futures.pop(camera, None)
+        if future:
+            future.cancel()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._requests.clear()
+            futures = list(self._futures.values())
+            self._futures.clear()
+            self._condition.notify()
+        for future in futures:
+            future.cancel()
+        if self._render_processes:
+            self._render_processes = False
+            RENDER_POOL.release()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._requests:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                camera = min(self._requests, key=lambda c: (c.map_index, self._requests[c]))
+                del self._requests[camera]
+
+            try:
+                map_data = camera.render_data()
+                cache_key = camera.cache_key(map_data)
+                cached = self._image_cache.get(cache_key) if cache_key else None
+                if cached:
+                    image, calibration_points = cached
+                elif self._render_processes and camera.map_index > 0 and not camera.entity_description.map_data_json:
+                    future = RENDER_POOL.submit(DreameVacuumMapRenderer.render_map_process, *camera.render_process_args(map_data))
+                    with self._condition:
+                        self._futures[camera] = future
+                    future.add_done_callback(partial(self._render_done, camera, cache_key))
+                    continue
+                else:
+                    image, calibration_points = camera.render_image(map_data)
+            except Exception as ex:
+                LOGGER.warning("Map render failed: %s", ex)
+                continue
+
+            if self._running:
+                self._hass.loop.call_soon_threadsafe(camera.set_image, image, calibration_points)
+            if cache_key and not cached:
+                self._image_cache.set(cache_key, image, calibration_points)
+
+    def _render_done(self, camera: DreameVacuumCameraEntity, cache_key: str | None, future: Future) -> None:
+        with self._condition:
+            # Drop the result if the camera has been rendered again or removed in the meantime
+            if self._futures.get(camera) is not future:
+                return
+            del self._futures[camera]
+
+        try:
+            image, calibration_points = future.result()
+        except Exception as ex:
+            LOGGER.warning("Map render failed: %s", ex)
+            return
+
+        if self._running:
+            self._hass.loop.call_soon_threadsafe(camera.set_image, image, calibration_points)
+        if cache_key:
+            self._image_cache.set(cache_key, image, calibration_points)
+
+
 class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
     """Defines a Dreame Vacuum Camera entity."""
 
@@ -125,9 +391,11 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         self,
         coordinator: DreameVacuumDataUpdateCoordinator,
         description: DreameVacuumCameraEntityDescription,
+        render_worker: DreameVacuumMapRenderWorker,
         color_scheme: str = None,
         icon_set: str = None,
         map_objects: list[str] = None,
+        render_profile: str = None,
         map_index: int = 0,
     ) -> None:
         """Initialize a Dreame Vacuum Camera entity."""
@@ -143,12 +411,14 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         self._last_map_request = 0
         self._attr_is_streaming = True
         self._calibration_points = None
+        self._render_worker = render_worker
+        self._render_config = (color_scheme, icon_set, map_objects, self.device.status.robot_shape, render_profile)
         
         self._available = self.device.device_connected and self.device.cloud_connected
         if description.map_data_json:
-            self._renderer = DreameVacuumMapDataRenderer()
+            self._renderer = DreameVacuumMapDataRenderer(render_profile)
         else:
-            self._renderer = DreameVacuumMapRenderer(color_scheme, icon_set, map_objects, self.device.status.robot_shape)
+            self._renderer = DreameVacuumMapRenderer(*self._render_config)
 
         self._image = self._renderer.default_map_image
         self._default_map = True
@@ -271,13 +541,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             and self.available
             and (self.map_index > 0 or self.device.status.located)
         ):
-            if self.map_index == 0 and not self.entity_description.map_data_json and map_data.last_updated != self._last_updated and not self._renderer.render_complete:
-                LOGGER.warning("Waiting render complete")
-
-            if (
-                self._renderer.render_complete
-                and map_data.last_updated != self._last_updated
-            ):
+            if map_data.last_updated != self._last_updated:
                 if self.map_index == 0 and not self.entity_description.map_data_json:
                     LOGGER.debug("Update map")
 
@@ -292,8 +556,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                     self._state = datetime.fromtimestamp(
                         int(map_data.last_updated))
 
-                self.coordinator.hass.async_create_task(self._update_image(
-                    self.device.get_map_for_render(self.map_index), self.device.status.robot_status))
+                self._render_worker.request(self)
         elif not self._default_map:
             self._image = self._default_map_image
             self._default_map = True
@@ -301,12 +564,53 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             self._last_updated = -1
             self._state = STATE_UNAVAILABLE
 
-    async def _update_image(self, map_data, robot_status) -> None:
-        self._image = self._renderer.render_map(map_data, robot_status)
-        if not self.entity_description.map_data_json and self._calibration_points != self._renderer.calibration_points:
-            self._calibration_points = self._renderer.calibration_points
+    def render_data(self) -> Any:
+        """Latest map data for rendering, called from the render worker thread."""
+        return self.device.get_map_for_render(self.map_index)
+
+    def cache_key(self, map_data: Any) -> str | None:
+        """Key of the rendered image in the image cache, only saved maps are cached because the current map changes on every frame."""
+        if self.map_index == 0 or not map_data or map_data.empty_map:
+            return None
+        renderer = self._renderer.__class__
+        color_scheme, icon_set, map_objects, robot_shape, render_profile = self._render_config
+        config = [
+            renderer.__name__,
+            renderer.VERSION,
+            color_scheme,
+            icon_set,
+            sorted(map_objects) if map_objects is not None else None,
+            robot_shape,
+            render_profile,
+            map_data.content_hash(),
+        ]
+        return f"{map_data.map_id}_{hashlib.sha256(json.dumps(config).encode('utf8')).hexdigest()[:32]}"
+
+    def render_image(self, map_data: Any) -> tuple[bytes, Any]:
+        """Render the map data, called from the render worker thread."""
+        image = self._renderer.render_map(map_data, self.device.status.robot_status)
+        if self.entity_description.map_data_json:
+            return image, None
+        return image, self._renderer.calibration_points
+
+    def render_process_args(self, map_data: Any) -> tuple:
+        """Arguments of the render process for the map data, called from the render worker thread."""
+        if map_data:
+            # Raw pixel data is only needed for decoding P frames, leave it out to reduce the amount of data sent to the render process
+            map_data.data = None
+        return (*self._render_config, map_data, self.device.status.robot_status)
+
+    @callback
+    def set_image(self, image: bytes, calibration_points: Any) -> None:
+        self._image = image
+        if not self.entity_description.map_data_json and self._calibration_points != calibration_points:
+            self._calibration_points = calibration_points
             self.coordinator.async_set_updated_data()
 
+    async def async_will_remove_from_hass(self) -> None:
+        self._render_worker.cancel(self)
+        await super().async_will_remove_from_hass()
+
     @property
     def _map_data(self) -> Any:
         return self.device.get_map(self.map_index)
@@ -21,7 +21,7 @@ from homeassistant.config_entries import (
     OptionsFlow,
 )
 
-from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST
+from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST, MAP_RENDER_PROFILE_LIST
 
 from .const import (
     DOMAIN,
@@ -33,6 +33,8 @@ from .const import (
     CONF_MAC,
     CONF_MAP_OBJECTS,
     CONF_PREFER_CLOUD,
+    CONF_RENDER_PROCESSES,
+    CONF_RENDER_PROFILE,
     NOTIFICATION,
     MAP_OBJECTS,
     NOTIFICATION_ID_2FA_LOGIN,
@@ -144,7 +146,9 @@ class DreameVacuumOptionsFlowHandler(OptionsFlow):
                     vol.Required(CONF_COLOR_SCHEME, default=options[CONF_COLOR_SCHEME]): vol.In(list(MAP_COLOR_SCHEME_LIST.keys())),
                     vol.Required(CONF_ICON_SET, default=options.get(CONF_ICON_SET, next(iter(MAP_ICON_SET_LIST)))): vol.In(list(MAP_ICON_SET_LIST.keys())),
                     vol.Required(CONF_MAP_OBJECTS, default=options.get(CONF_MAP_OBJECTS, list(MAP_OBJECTS.keys()))): cv.multi_select(MAP_OBJECTS),
+                    vol.Required(CONF_RENDER_PROFILE, default=options.get(CONF_RENDER_PROFILE, next(iter(MAP_RENDER_PROFILE_LIST)))): vol.In(list(MAP_RENDER_PROFILE_LIST.keys())),
                     vol.Required(CONF_PREFER_CLOUD, default=options.get(CONF_PREFER_CLOUD, False)): bool,
+                    vol.Required(CONF_RENDER_PROCESSES, default=options.get(CONF_RENDER_PROCESSES, False)): bool,
                 }
             )
 
@@ -427,6 +431,7 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                     CONF_COLOR_SCHEME: user_input.get(CONF_COLOR_SCHEME),
                     CONF_ICON_SET: user_input.get(CONF_ICON_SET),
                     CONF_MAP_OBJECTS: user_input.get(CONF_MAP_OBJECTS),
+                    CONF_RENDER_PROFILE: user_input.get(CONF_RENDER_PROFILE),
                     CONF_PREFER_CLOUD: self.prefer_cloud,
                 },
             )
@@ -454,6 +459,7 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_COLOR_SCHEME, default=default_color_scheme): vol.In(list(MAP_COLOR_SCHEME_LIST.keys())),
                     vol.Required(CONF_ICON_SET, default=default_icon_set): vol.In(list(MAP_ICON_SET_LIST.keys())),
                     vol.Required(CONF_MAP_OBJECTS, default=default_objects): cv.multi_select(MAP_OBJECTS),
+                    vol.Required(CONF_RENDER_PROFILE, default=next(iter(MAP_RENDER_PROFILE_LIST))): vol.In(list(MAP_RENDER_PROFILE_LIST.keys())),
                 }
             )
 
@@ -22,6 +22,8 @@ CONF_TYPE: Final = "configuration_type"
 CONF_MAC: Final = "mac"
 CONF_MAP_OBJECTS: Final = "map_objects"
 CONF_PREFER_CLOUD: Final = "prefer_cloud"
+CONF_RENDER_PROCESSES: Final = "render_processes"
+CONF_RENDER_PROFILE: Final = "render_profile"
 
 CONTENT_TYPE: Final = "image/png"
 
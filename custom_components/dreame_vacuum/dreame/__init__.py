@@ -17,6 +17,7 @@ from .types import (
     ACTION_AVAILABILITY,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_RENDER_PROFILE_LIST,
 )
 from .const import (
     SUCTION_LEVEL_CODE_TO_NAME,
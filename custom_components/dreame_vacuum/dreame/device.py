@@ -154,6 +154,8 @@ class DreameVacuumDevice:
         self._update_fail_count: int = 0 # Update failed counter
         # Map Manager object. Only available when cloud connection is present
         self._map_manager: DreameMapVacuumMapManager = None
+        # Optimized pixels of the latest rendered map data, only accessed from the render thread
+        self._optimized_map: tuple = None
         self._update_callback = None  # External update callback for device
         self._error_callback = None  # External update failed callback
         # External update callbacks for specific device property
@@ -880,6 +882,43 @@ class DreameVacuumDevice:
         self.schedule_update(1)
         return False
 
+    def _optimize_map_for_render(self, map_data: MapData) -> None:
+        """Optimizes the pixels of the map data copy, result is reused for the next copies until the pixels of the map or the selected map are changed."""
+        saved_map_data = self._map_manager.selected_map if map_data.saved_map_status == 2 else None
+        if saved_map_data is not None:
+            saved_map_data = saved_map_data.snapshot()
+
+        key = (
+            map_data.map_id,
+            map_data.pixels_version,
+            map_data.geometry_version,
+            saved_map_data.pixels_version if saved_map_data else None,
+            saved_map_data.geometry_version if saved_map_data else None,
+        )
+        if self._optimized_map is None or self._optimized_map[0] != key:
+            map_data = self._map_manager.optimizer.optimize(map_data, saved_map_data)
+            map_data.set_changed("optimized_pixel_type", "optimized_dimensions")
+            self._optimized_map = (
+                key,
+                map_data.optimized_pixel_type,
+                copy.copy(map_data.optimized_dimensions),
+                map_data.optimized_charger_position,
+                map_data.pixels_version,
+                map_data.geometry_version,
+            )
+        else:
+            # Versions are reused so the renderer does not redraw the same optimized pixels
+            (
+                _,
+                map_data.optimized_pixel_type,
+                map_data.optimized_dimensions,
+                map_data.optimized_charger_position,
+                map_data.pixels_version,
+                map_data.geometry_version,
+            ) = self._optimized_map
+            map_data.optimized_dimensions = copy.copy(map_data.optimized_dimensions)
+        map_data.need_optimization = False
+
     def get_map_for_render(self, map_index: int) -> MapData | None:
         """Makes changes on map data for device related properties for renderer.
         Map manager does not need any device property for parsing and storing map data but map renderer does. 
@@ -887,15 +926,16 @@ class DreameVacuumDevice:
 
         map_data = self.get_map(map_index)
         if map_data:
+            # Map manager keeps updating the map data while it is rendered on the render thread, renderer and optimizer only get a copy of it
+            map_data = map_data.snapshot()
             if map_data.need_optimization:
-                map_data = self._map_manager.optimizer.optimize(map_data, self._map_manager.selected_map if map_data.saved_map_status == 2 else None)
-                map_data.need_optimization = False
-            
-            map_data = copy.deepcopy(map_data)
-            
+                self._optimize_map_for_render(map_data)
+
             if map_data.optimized_pixel_type is not None:
                 map_data.pixel_type = map_data.optimized_pixel_type
                 map_data.dimensions = map_data.optimized_dimensions
+                # Changed pixel areas are only known for the pixel type before optimization
+                map_data.changed_pixels = None
                 if map_data.optimized_charger_position is not None:
                     map_data.charger_position = map_data.optimized_charger_position
 
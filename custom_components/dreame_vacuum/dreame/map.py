@@ -11,6 +11,7 @@ import traceback
 import copy
 import numpy as np
 import hashlib
+import pybase64
 from py_mini_racer import MiniRacer
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -19,8 +20,10 @@ from typing import Any
 from time import sleep
 from io import BytesIO
 from typing import Optional, Tuple
-from functools import cmp_to_key
-from threading import Timer
+from functools import cmp_to_key, lru_cache
+from threading import Timer, Lock
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from .resources import *
 from .protocol import DreameVacuumProtocol
 from .exceptions import DeviceUpdateFailedException
@@ -32,6 +35,7 @@ from .types import (
     DreameVacuumActionMapping,
     ObstacleType,
     PathType,
+    PathList,
     Point,
     Obstacle,
     MapDataPartial,
@@ -46,8 +50,10 @@ from .types import (
     MapRendererLayer,
     MapRendererColorScheme,
     MapRendererConfig,
+    MapRendererProfile,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_RENDER_PROFILE_LIST,
     ALine,
     CLine,
     Paths,
@@ -120,6 +126,11 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 class DreameMapVacuumMapManager:
+    # Maximum number of threads used for decoding map data received from the cloud in batches
+    DECODE_WORKERS = 4
+    # Default memory budget in bytes for the decoded frame cache
+    PARTIAL_MAP_CACHE_SIZE = 16 * 1024 * 1024
+
     def __init__(
         self, _protocol: DreameVacuumProtocol
     ) -> None:
@@ -129,6 +140,13 @@ class DreameMapVacuumMapManager:
         self._update_callback = None
         self._error_callback = None
         self._update_timer: Timer = None
+        self._decode_executor: ThreadPoolExecutor = None
+        self._partial_map_cache: OrderedDict[bytes, MapDataPartial] = OrderedDict()
+        self._partial_map_cache_lock: Lock = Lock()
+        self._partial_map_cache_bytes: int = 0
+        self.partial_map_cache_size: int = DreameMapVacuumMapManager.PARTIAL_MAP_CACHE_SIZE
+        self.partial_map_cache_hits: int = 0
+        self.partial_map_cache_misses: int = 0
         self._update_running: bool = False
         self._update_interval: float = 10
         self._device_running: bool = False
@@ -151,6 +169,8 @@ class DreameMapVacuumMapManager:
         self._current_timestamp_ms: int = None
         self._file_urls: dict[str, str] = {}
         self._saved_map_data: dict[int, MapData] = {}
+        self._map_list_entries: dict[bytes, MapData] = {}
+        self._map_list_downloaded_md5: str = None
         self._map_list: list[int] = []
         self._recovery_map_data: dict[int, MapData] = {}
         self._need_map_request: bool = False
@@ -229,6 +249,8 @@ class DreameMapVacuumMapManager:
         if len(object_name_result):
             self._latest_object_name_time = object_name_result[0][MAP_PARAMETER_TIME] + 1
 
+        raw_maps = []
+        timestamps = []
         for data in map_data_result:
             value = json.loads(data[MAP_PARAMETER_VALUE])
             pmap = value[0]
@@ -236,8 +258,14 @@ class DreameMapVacuumMapManager:
             if data.get(MAP_PARAMETER_TIME):
                 timestamp = data[MAP_PARAMETER_TIME] * 1000
 
-            partial_map = self._decode_map_partial(pmap, timestamp)
+            if self._outdated_partial_map(DreameVacuumMapDecoder.peek_frame_header(pmap)):
+                continue
+
+            raw_maps.append(pmap)
+            timestamps.append(timestamp)
 
+        for partial_map, timestamp in zip(self._decode_map_partials(raw_maps), timestamps):
+            partial_map = self._update_latest_map(partial_map, timestamp)
             if partial_map:
                 if partial_map.frame_type == MapFrameType.I.value:
                     self._add_map_data(partial_map)
@@ -275,7 +303,7 @@ class DreameMapVacuumMapManager:
                     object_name[0], timestamp)
                 if response:
                     partial_map = self._decode_map_partial(
-                        response.decode(), timestamp, key
+                        response, timestamp, key
                     )
                     if partial_map:
                         if self._map_data is None or partial_map.frame_type == MapFrameType.I.value:
@@ -558,7 +586,7 @@ class DreameMapVacuumMapManager:
         response = self._get_interim_file_data(object_name, timestamp)
         return response, key
 
-    def _get_interim_file_data(self, object_name: str = "", timestamp=None) -> str | None:
+    def _get_interim_file_data(self, object_name: str = "", timestamp=None) -> bytes | None:
         if self._protocol.cloud.logged_in:
             if object_name is None or object_name == "":
                 _LOGGER.debug("Get object name from cloud")
@@ -598,8 +626,118 @@ class DreameMapVacuumMapManager:
                 url = self._file_urls[object_name][MAP_PARAMETER_URL]
         return url
 
+    def _outdated_partial_map(self, header: MapDataPartial | None) -> bool:
+        # Only P frames of the current map can be skipped by their header, frame timestamp is stored in the data json and map id change is detected by it
+        if (
+            header is None
+            or header.frame_type != MapFrameType.P.value
+            or self._current_frame_id is None
+            or header.map_id != self._latest_map_id
+            or self._current_map_id != self._latest_map_id
+        ):
+            return False
+
+        if header.frame_id <= self._current_frame_id or (
+            header.map_id in self._map_data_queue
+            and header.frame_id in self._map_data_queue[header.map_id]
+        ):
+            _LOGGER.debug(
+                "Skip frame before decoding, frame id %s:%s <= %s:%s",
+                header.map_id,
+                header.frame_id,
+                self._current_map_id,
+                self._current_frame_id,
+            )
+            return True
+        return False
+
+    def _get_cached_partial_map(self, raw_map, key=None) -> Tuple[bytes, MapDataPartial | None]:
+        # Same map data or object file is received multiple times on map requests and reconnects, decoded frames are cached by the hash of the payload
+        content_hash = hashlib.sha256(raw_map.encode("utf8") if isinstance(raw_map, str) else raw_map)
+        if key is not None:
+            content_hash.update(key.encode("utf8"))
+        content_hash = content_hash.digest()
+
+        with self._partial_map_cache_lock:
+            partial_map = self._partial_map_cache.get(content_hash)
+            if partial_map is None:
+                self.partial_map_cache_misses = self.partial_map_cache_misses + 1
+                return content_hash, None
+
+            self._partial_map_cache.move_to_end(content_hash)
+            self.partial_map_cache_hits = self.partial_map_cache_hits + 1
+        return content_hash, DreameMapVacuumMapManager._copy_partial_map(partial_map)
+
+    @staticmethod
+    def _copy_partial_map(partial_map: MapDataPartial) -> MapDataPartial:
+        # Timestamp of the returned frame can be updated by the manager and the decoded map data takes lists from the data json that are edited
+        # in place (cleanset, segment neighbors), raw frame bytes are immutable and shared
+        partial_map = copy.copy(partial_map)
+        partial_map.data_json = copy.deepcopy(partial_map.data_json)
+        return partial_map
+
+    def _cache_partial_map(self, content_hash: bytes, partial_map: MapDataPartial | None) -> None:
+        if partial_map is None or partial_map.raw is None:
+            return
+
+        size = len(partial_map.raw)
+        if size > self.partial_map_cache_size:
+            return
+
+        with self._partial_map_cache_lock:
+            if content_hash in self._partial_map_cache:
+                return
+
+            self._partial_map_cache[content_hash] = DreameMapVacuumMapManager._copy_partial_map(partial_map)
+            self._partial_map_cache_bytes = self._partial_map_cache_bytes + size
+            while self._partial_map_cache_bytes > self.partial_map_cache_size:
+                _, removed = self._partial_map_cache.popitem(last=False)
+                self._partial_map_cache_bytes = self._partial_map_cache_bytes - len(removed.raw)
+
+    def _decode_map_partials(self, raw_maps: list[str]) -> list[MapDataPartial | None]:
+        results = []
+        missing = []
+        for raw_map in raw_maps:
+            content_hash, partial_map = self._get_cached_partial_map(raw_map)
+            results.append(partial_map)
+            if partial_map is None:
+                missing.append((len(results) - 1, content_hash, raw_map))
+
+        decoded = None
+        # Decompression and decryption releases the GIL so map data batches can be decoded in parallel, results are returned in the same order
+        if len(missing) > 1:
+            executor = self._decode_executor
+            if executor is None:
+                executor = self._decode_executor = ThreadPoolExecutor(
+                    max_workers=DreameMapVacuumMapManager.DECODE_WORKERS, thread_name_prefix="dreame_map_decoder"
+                )
+            futures = []
+            try:
+                for _, _, raw_map in missing:
+                    futures.append(executor.submit(DreameVacuumMapDecoder.decode_map_partial, raw_map))
+            except RuntimeError:
+                # Executor is shut down while the device is disconnecting, decode the batch on this thread instead
+                for future in futures:
+                    future.cancel()
+                futures = None
+            if futures is not None:
+                decoded = [future.result() for future in futures]
+        if decoded is None:
+            decoded = [DreameVacuumMapDecoder.decode_map_partial(raw_map) for _, _, raw_map in missing]
+
+        for (index, content_hash, _), partial_map in zip(missing, decoded):
+            self._cache_partial_map(content_hash, partial_map)
+            results[index] = partial_map
+        return results
+
     def _decode_map_partial(self, raw_map, timestamp=None, key=None) -> MapDataPartial | None:
-        partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, key)
+        content_hash, partial_map = self._get_cached_partial_map(raw_map, key)
+        if partial_map is None:
+            partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, key)
+            self._cache_partial_map(content_hash, partial_map)
+        return self._update_latest_map(partial_map, timestamp)
+
+    def _update_latest_map(self, partial_map: MapDataPartial | None, timestamp=None) -> MapDataPartial | None:
         if partial_map is not None:
             # After restart or unsuccessful start robot returns timestamp_ms as uptime and that messes up with the latest map/frame id detection.
             # I could not figure out how app handles with this issue but i have added this code to update time stamp as request/object time.
@@ -622,9 +760,9 @@ class DreameMapVacuumMapManager:
     def _add_map_data_file(self, object_name: str, timestamp) -> None:
         response, key = self._get_object_file_data(object_name, timestamp)
         if response is not None:
-            self._add_raw_map_data(response.decode(), timestamp, key)
+            self._add_raw_map_data(response, timestamp, key)
 
-    def _add_raw_map_data(self, raw_map: str, timestamp=None, key=None) -> bool:
+    def _add_raw_map_data(self, raw_map: str | bytes, timestamp=None, key=None) -> bool:
         return self._add_map_data(self._decode_map_partial(raw_map, timestamp, key))
 
     def _add_map_data(self, partial_map: MapDataPartial) -> None:
@@ -730,8 +868,8 @@ class DreameMapVacuumMapManager:
                     partial_map, self._map_data, self._vslam_map,
                 )
                 if map_data:
+                    map_data.last_updated = time.time()
                     self._map_data = map_data
-                    self._map_data.last_updated = time.time()
                     self._updated_frame_id = None
                     self._current_frame_id = map_data.frame_id
                     self._current_map_id = map_data.map_id
@@ -837,11 +975,12 @@ class DreameMapVacuumMapManager:
                         elif map_data.robot_position is None and map_data.restored_map and not self._device_docked and self._map_data and not map_data.docked:
                             map_data.robot_position = self._map_data.robot_position
 
+                    map_data.update_versions(self._map_data)
                     changed = (
                         self._current_frame_id is None
                         or self._map_data is None
                         or map_data != self._map_data
-                        or map_data.segments != self._map_data.segments
+                        or map_data.changed(self._map_data, "segments")
                     )
 
                     if (
@@ -867,6 +1006,7 @@ class DreameMapVacuumMapManager:
                                     map_data.path = self._map_data.path
                                     map_data.segments = self._map_data.segments
                                     map_data.cleanset = self._map_data.cleanset
+                                    map_data.update_versions(self._map_data)
                                     changed = map_data != self._map_data
                                 else:
                                     changed = False
@@ -879,6 +1019,7 @@ class DreameMapVacuumMapManager:
                             map_data.optimized_pixel_type = copy.deepcopy(self._map_data.optimized_pixel_type)
                             map_data.optimized_dimensions = copy.deepcopy(self._map_data.optimized_dimensions)
                             map_data.optimized_charger_position = copy.deepcopy(self._map_data.optimized_charger_position)
+                            map_data.update_versions(self._map_data)
 
                         self._map_data = map_data
                         self._current_frame_id = map_data.frame_id
@@ -947,6 +1088,9 @@ class DreameMapVacuumMapManager:
         if wait >= 0:
             self._update_timer = Timer(wait, self._update_task)
             self._update_timer.start()
+        elif self._decode_executor is not None:
+            self._decode_executor.shutdown(wait=False)
+            self._decode_executor = None
 
     def update(self) -> None:
         if self._update_running:
@@ -1042,6 +1186,7 @@ class DreameMapVacuumMapManager:
                     self._map_data.path = None
                     self._map_data.need_optimization = False
                     self._map_data.saved_map_status = 2
+                    self._map_data.update_versions()
                     self._map_data.last_updated = time.time()
                     self._map_data_changed()
                     
@@ -1084,7 +1229,10 @@ class DreameMapVacuumMapManager:
             if map_list and object_name and object_name != "":
                 if self._map_list_object_name != object_name or self._map_list_md5 != md5:
                     self._map_list_object_name = object_name
-                    if not self._device_running and self._map_list_md5 is not None:
+                    # Object name of the map list changes even if the content is same, map list is downloaded only when its md5 is changed
+                    if not self._device_running and self._map_list_md5 is not None and (
+                        md5 is None or md5 != self._map_list_downloaded_md5
+                    ):
                         self.request_next_map_list()
                         self.schedule_update(2)
                     self._map_list_md5 = md5
@@ -1125,22 +1273,39 @@ class DreameMapVacuumMapManager:
                 changed = False
                 now = time.time()
                 map_list = {}
+                map_list_entries = {}
                 if saved_map_list:
                     for v in saved_map_list:
                         if v.get(MAP_PARAMETER_MAP):
-                            saved_map_data = DreameVacuumMapDecoder.decode_saved_map(
-                                v[MAP_PARAMETER_MAP], self._vslam_map, int(v[MAP_PARAMETER_ANGLE]) if v.get(
-                                    MAP_PARAMETER_ANGLE) else 0
-                            )
-                            if saved_map_data is not None:
-                                name = v.get(MAP_PARAMETER_NAME)
-                                if name:
+                            rotation = int(v[MAP_PARAMETER_ANGLE]) if v.get(
+                                MAP_PARAMETER_ANGLE) else 0
+                            name = v.get(MAP_PARAMETER_NAME)
+                            entry_hash = hashlib.sha256(
+                                f"{v[MAP_PARAMETER_MAP]},{rotation},{name}".encode("utf8")).digest()
+                            saved_map_data = self._map_list_entries.get(entry_hash)
+                            if (
+                                saved_map_data is None
+                                or self._saved_map_data.get(saved_map_data.map_id) is not saved_map_data
+                            ):
+                                # Rotation and name are part of the entry hash so their changes miss this cache, decode_saved_map
+                                # returns a copy of its memoized saved map for them and the payload is not decoded again
+                                saved_map_data = DreameVacuumMapDecoder.decode_saved_map(
+                                    v[MAP_PARAMETER_MAP], self._vslam_map, rotation
+                                )
+                                if saved_map_data is not None and name:
                                     saved_map_data.custom_name = name
                                     saved_map_data.map_name = name
+
+                            if saved_map_data is not None:
                                 map_list[saved_map_data.map_id] = saved_map_data
+                                map_list_entries[entry_hash] = saved_map_data.map_id
 
                     for (map_id, saved_map_data) in sorted(map_list.items()):
                         if map_id in self._saved_map_data:
+                            if self._saved_map_data[map_id] is saved_map_data:
+                                # Saved map is not changed since the previous map list
+                                continue
+
                             if self._selected_map_id == map_id and self._map_data:
                                 saved_map_data.cleanset = self._map_data.cleanset
                             else:
@@ -1174,6 +1339,11 @@ class DreameMapVacuumMapManager:
                         del self._saved_map_data[map_id]
                         changed = True
 
+                self._map_list_entries = {
+                    k: self._saved_map_data[v] for (k, v) in map_list_entries.items() if v in self._saved_map_data
+                }
+                self._map_list_downloaded_md5 = self._map_list_md5
+
                 selected_map_id = map_info[MAP_PARAMETER_CURR_ID]
                 if (
                     selected_map_id in self._saved_map_data
@@ -1274,11 +1444,14 @@ class DreameMapVacuumMapEditor:
         self.map_manager._updated_frame_id = frame_id
 
     def refresh_map(self, map_id: int = None) -> None:
+        # Map data is edited in place, every field group gets a new version
         if map_id:
             if self._saved_map_data and map_id in self._saved_map_data:
+                self._saved_map_data[map_id].update_versions()
                 self._saved_map_data[map_id].last_updated = time.time()
             return
         if self._map_data is not None:
+            self._map_data.update_versions()
             self._map_data.last_updated = time.time()
 
     def set_active_areas(self, active_areas: list[list[int]]) -> None:
@@ -1435,6 +1608,7 @@ class DreameMapVacuumMapEditor:
 
                 data = np.zeros((map_data.dimensions.width *
                                 map_data.dimensions.height), np.uint8)
+                map_data.pixel_type = map_data.pixel_type.copy()
                 for y in range(map_data.dimensions.height):
                     for x in range(map_data.dimensions.width):
                         index = y * map_data.dimensions.width + x
@@ -1446,7 +1620,7 @@ class DreameMapVacuumMapEditor:
                         if int(map_data.pixel_type[x, y]) == segments[1]:
                             map_data.pixel_type[x, y] = segments[0]
 
-                map_data.data = bytes(data)
+                map_data.data = data
                 del self.map_manager._saved_map_data[map_id].segments[segments[1]]
                 new_segments = DreameVacuumMapDecoder.get_segments(map_data, self.map_manager._vslam_map)
                 map_data.segments[segments[0]].x = new_segments[segments[0]].x
@@ -1491,6 +1665,7 @@ class DreameMapVacuumMapEditor:
                 new_map.saved_map_status = -1
                 new_map.saved_map = True
                 new_map.cleanset = {}
+                new_map.update_versions()
                 self.map_manager._saved_map_data[new_map.map_id] = new_map
                 del self.map_manager._saved_map_data[map_id]
                 self.map_manager._refresh_map_list()
@@ -1847,6 +2022,79 @@ class DreameMapVacuumMapEditor:
 class DreameVacuumMapDecoder:
     HEADER_SIZE = 27
     AES_IV = ""
+    BASE64_URLSAFE_TABLE = bytes.maketrans(b"-_", b"+/")
+    # Number of base64 characters decoded for reading only the frame header, enough for the zlib header and the first deflate block header
+    PEEK_SIZE = 1024
+    # Number of previous pixels versions that the changed pixel areas are kept for
+    CHANGED_PIXELS_HISTORY = 10
+
+    _pixel_types: dict[str, np.ndarray] = {}
+    # Decoded saved maps by the hash of their content, same saved map is embedded to every I frame while docked
+    _saved_maps: OrderedDict[bytes, MapData] = OrderedDict()
+    _saved_maps_lock: Lock = Lock()
+    SAVED_MAP_CACHE_SIZE = 8
+
+    # Lookup tables for converting raw I frame pixel values to pixel types, indexed by the raw pixel value.
+    _PIXEL_VALUES = np.arange(256)
+
+    FRAME_MAP_PIXEL_TYPES = np.select(
+        [
+            (_PIXEL_VALUES >> 2) == 63,
+            (_PIXEL_VALUES >> 2) == 62,
+            (_PIXEL_VALUES >> 2) == 61,
+            (_PIXEL_VALUES >> 2) > 0,
+            ((_PIXEL_VALUES & 0x3F) == 1) | ((_PIXEL_VALUES & 0x3F) == 3),
+            (_PIXEL_VALUES & 0x3F) == 2,
+        ],
+        [
+            MapPixelType.WALL.value,
+            MapPixelType.FLOOR.value,
+            MapPixelType.UNKNOWN.value,
+            _PIXEL_VALUES >> 2,
+            MapPixelType.NEW_SEGMENT.value,
+            MapPixelType.WALL.value,
+        ],
+        MapPixelType.OUTSIDE.value,
+    ).astype(np.uint8)
+
+    # as implemented on the app
+    NEW_MAP_PIXEL_TYPES = np.select(
+        [
+            ((_PIXEL_VALUES & 0x3F) == 1) | ((_PIXEL_VALUES & 0x3F) == 3),
+            (_PIXEL_VALUES & 0x3F) == 2,
+        ],
+        [
+            MapPixelType.NEW_SEGMENT.value,
+            MapPixelType.WALL.value,
+        ],
+        MapPixelType.OUTSIDE.value,
+    ).astype(np.uint8)
+
+    VSLAM_MAP_PIXEL_TYPES = np.select(
+        [
+            (_PIXEL_VALUES & 0b00000011) == 1,
+            (_PIXEL_VALUES & 0b00000011) == 3,
+            (_PIXEL_VALUES & 0b00000011) == 2,
+        ],
+        [
+            MapPixelType.NEW_SEGMENT.value,
+            MapPixelType.NEW_SEGMENT_UNKNOWN.value,
+            MapPixelType.WALL.value,
+        ],
+        MapPixelType.OUTSIDE.value,
+    ).astype(np.uint8)
+
+    MAP_PIXEL_TYPES = np.select(
+        [
+            (_PIXEL_VALUES >> 7) > 0,
+            (_PIXEL_VALUES & 0x3F) > 0,
+        ],
+        [
+            MapPixelType.WALL.value,
+            _PIXEL_VALUES & 0x3F,
+        ],
+        MapPixelType.OUTSIDE.value,
+    ).astype(np.uint8)
 
     @staticmethod
     def _read_int_8(data: bytes, offset: int = 0) -> int:
@@ -1932,79 +2180,125 @@ class DreameVacuumMapDecoder:
 
         return MapPixelType.OUTSIDE.value
 
+    @staticmethod
+    def _get_pixel_types(map_data: MapData, vslam_map: bool = False) -> np.ndarray:
+        """Lookup table version of _get_pixel_type indexed by the pixel value"""
+        if map_data.frame_map:
+            key = "frame_map"
+        elif vslam_map:
+            key = "vslam_map"
+        else:
+            key = f"map_{map_data.saved_map_status == 1 or map_data.saved_map_status == 0}"
+
+        if key not in DreameVacuumMapDecoder._pixel_types:
+            DreameVacuumMapDecoder._pixel_types[key] = np.array(
+                [DreameVacuumMapDecoder._get_pixel_type(map_data, pixel, vslam_map) for pixel in range(256)],
+                dtype=np.uint8,
+            )
+        return DreameVacuumMapDecoder._pixel_types[key]
+
     @staticmethod
     def _get_segment_center(map_data, segment_id: int, center: int, vertical: bool) -> int | None:
         # Find center point implemented as on the app
-        lines = []
-        zero_pixels = -1
-        segment_pixel = 0
-        line = None
+        data = np.frombuffer(map_data.data, dtype=np.uint8).reshape(
+            map_data.dimensions.height, map_data.dimensions.width
+        )
+        values = (data[:, center] if vertical else data[center, :]) & 0x3F
 
-        for k in range(
-            map_data.dimensions.height if vertical else map_data.dimensions.width
-        ):
-            pixel_type = (
-                map_data.data[
-                    (k * map_data.dimensions.width + center)
-                    if vertical
-                    else (center * map_data.dimensions.width + k)
-                ]
-                & 0x3F
-            )
-            if pixel_type == segment_id:
-                segment_pixel = k
-                zero_pixels = 0
-                if line is None:
-                    line = [segment_pixel]
-            elif pixel_type == 0:
-                if zero_pixels >= 0:
-                    zero_pixels = zero_pixels + 1
-                    if zero_pixels >= 4 and line is not None:
-                        line.append(segment_pixel)
-                        lines.append(line)
-                        line = None
-            elif line is not None:
-                line.append(segment_pixel)
-                lines.append(line)
-                line = None
-
-        if line is not None:
-            line.append(segment_pixel)
-            lines.append(line)
-            line = None
-
-        if lines:
-            maxLine = lines[0]
-            if len(lines) > 1:
-                for item in lines[1:]:
-                    if item[1] - item[0] > maxLine[1] - maxLine[0]:
-                        maxLine = item
-
-            return int(math.ceil((maxLine[1] - maxLine[0]) / 2 + maxLine[0]))
-        return None
-            
+        # Segment pixels separated by less than four empty pixels belong to the same line
+        segment_pixels = np.flatnonzero(values == segment_id)
+        if not segment_pixels.size:
+            return None
+
+        filled_pixels = np.cumsum(values != 0)
+        gaps = (segment_pixels[1:] - segment_pixels[:-1] - 1 >= 4) | (
+            filled_pixels[segment_pixels[1:] - 1] - filled_pixels[segment_pixels[:-1]] > 0
+        )
+        starts = segment_pixels[np.concatenate(([True], gaps))]
+        ends = segment_pixels[np.concatenate((gaps, [True]))]
+        line = int(np.argmax(ends - starts))
+        return int(math.ceil((ends[line] - starts[line]) / 2 + starts[line]))
 
     @staticmethod
-    def decode_map_partial(raw_map, key=None) -> MapDataPartial | None:
-        _LOGGER.debug("raw_map: %s", raw_map)
-        raw_map = raw_map.replace("_", "/").replace("-", "+")
+    def data_changed(data, other_data) -> bool:
+        """Compare raw image data of two maps which can be stored as bytes or uint8 arrays"""
+        if data is None or other_data is None:
+            return data is not other_data
+        return data is not other_data and not np.array_equal(
+            np.frombuffer(data, dtype=np.uint8), np.frombuffer(other_data, dtype=np.uint8)
+        )
 
-        if "," in raw_map and key is None:
-            values = raw_map.split(",")
-            key = values[1]
-            raw_map = values[0]
+    @staticmethod
+    def _decode_base64(raw_map, key=None, size=None) -> Tuple[bytes, Optional[str]]:
+        if isinstance(raw_map, str):
+            raw_map = raw_map.encode("utf8")
+
+        length = len(raw_map)
+        if key is None:
+            index = raw_map.find(b",")
+            if index >= 0:
+                key = raw_map[index + 1:].decode("utf8")
+                length = index
+
+        if size is not None:
+            length = min(length, size)
+
+        # Map data is encoded with the URL safe alphabet, translate both alphabets and decode leniently if it is not.
+        if raw_map.find(b"+", 0, length) < 0 and raw_map.find(b"/", 0, length) < 0:
+            try:
+                return pybase64.b64decode(memoryview(raw_map)[:length], altchars=b"-_", validate=True), key
+            except ValueError:
+                pass
+        return pybase64.b64decode(raw_map[:length].translate(DreameVacuumMapDecoder.BASE64_URLSAFE_TABLE)), key
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _get_cipher(key: str, iv: str) -> Cipher:
+        # Derived key and cipher objects are reused for all frames of a map, only the decryptor context is created per frame
+        key = hashlib.sha256(key.encode()).hexdigest()[
+            0:32].encode('utf8')
+        return Cipher(algorithms.AES(key), modes.CBC(
+            iv.encode('utf8')), backend=default_backend())
+
+    @staticmethod
+    def _decrypt(raw_map: bytes, key: str, final: bool = True) -> memoryview:
+        decryptor = DreameVacuumMapDecoder._get_cipher(key, DreameVacuumMapDecoder.AES_IV).decryptor()
+        buffer = bytearray(len(raw_map) + 15)
+        length = decryptor.update_into(raw_map, buffer)
+        if final:
+            decryptor.finalize()
+        return memoryview(buffer)[:length]
 
-        raw_map = base64.decodebytes(raw_map.encode("utf8"))
+    @staticmethod
+    def peek_frame_header(raw_map, key=None) -> MapDataPartial | None:
+        """Read map_id, frame_id and frame_type of the raw map by only decoding and inflating the header"""
+        try:
+            raw_map, key = DreameVacuumMapDecoder._decode_base64(
+                raw_map, key, DreameVacuumMapDecoder.PEEK_SIZE)
+            if key is not None:
+                raw_map = DreameVacuumMapDecoder._decrypt(raw_map, key, False)
+            raw_map = zlib.decompressobj().decompress(raw_map, DreameVacuumMapDecoder.HEADER_SIZE)
+        except:
+            return None
+
+        if len(raw_map) < DreameVacuumMapDecoder.HEADER_SIZE:
+            return None
+
+        partial_map = MapDataPartial()
+        partial_map.map_id = DreameVacuumMapDecoder._read_int_16_le(raw_map)
+        partial_map.frame_id = DreameVacuumMapDecoder._read_int_16_le(
+            raw_map, 2)
+        partial_map.frame_type = DreameVacuumMapDecoder._read_int_8(raw_map, 4)
+        return partial_map
+
+    @staticmethod
+    def decode_map_partial(raw_map, key=None) -> MapDataPartial | None:
+        _LOGGER.debug("raw_map: %s", raw_map)
+        raw_map, key = DreameVacuumMapDecoder._decode_base64(raw_map, key)
 
         if key is not None:
             try:
-                key = hashlib.sha256(key.encode()).hexdigest()[
-                    0:32].encode('utf8')
-                iv = DreameVacuumMapDecoder.AES_IV.encode('utf8')
-                cipher = Cipher(algorithms.AES(key), modes.CBC(
-                    iv), backend=default_backend())
-                decryptor = cipher.decryptor()
-                raw_map = decryptor.update(raw_map) + decryptor.finalize()
+                raw_map = DreameVacuumMapDecoder._decrypt(raw_map, key)
             except Exception as ex:
                 _LOGGER.error(f"Map data decryption failed: {ex}. Private key might be missing, please report this issue with your device model https://github.com/Tasshack/dreame-vacuum/issues/new?assignees=Tasshack&labels=bug&template=bug_report.md&title=Map%20data%20decryption%20failed")
                 return None
@@ -2030,7 +2324,7 @@ class DreameVacuumMapDecoder:
         )
         if len(raw_map) >= image_size:
             try:
-                data_json = json.loads(raw_map[image_size:].decode("utf8"))
+                data_json = json.loads(str(memoryview(raw_map)[image_size:], "utf8"))
                 if data_json.get("timestamp_ms"):
                     partial_map.timestamp_ms = int(data_json["timestamp_ms"])
 
@@ -2047,7 +2341,62 @@ class DreameVacuumMapDecoder:
 
     @staticmethod
     def decode_saved_map(raw_map: str, vslam_map: bool, rotation: int = 0) -> MapData | None:
-        return DreameVacuumMapDecoder.decode_map(raw_map, vslam_map, rotation)[0]
+        content_hash = hashlib.sha256(raw_map.encode("utf8") if isinstance(raw_map, str) else raw_map)
+        content_hash.update(str(vslam_map).encode("utf8"))
+        content_hash = content_hash.digest()
+
+        with DreameVacuumMapDecoder._saved_maps_lock:
+            saved_map_data = DreameVacuumMapDecoder._saved_maps.get(content_hash)
+            if saved_map_data is not None:
+                DreameVacuumMapDecoder._saved_maps.move_to_end(content_hash)
+
+        if saved_map_data is None:
+            # Saved map is decoded without rotation so rotation changes does not require decoding it again
+            saved_map_data = DreameVacuumMapDecoder.decode_map(raw_map, vslam_map, None)[0]
+            if saved_map_data is None:
+                return None
+
+            # Pixel buffers are shared between all copies of the decoded saved map
+            if saved_map_data.pixel_type is not None:
+                saved_map_data.pixel_type.setflags(write=False)
+
+            with DreameVacuumMapDecoder._saved_maps_lock:
+                DreameVacuumMapDecoder._saved_maps[content_hash] = saved_map_data
+                if len(DreameVacuumMapDecoder._saved_maps) > DreameVacuumMapDecoder.SAVED_MAP_CACHE_SIZE:
+                    DreameVacuumMapDecoder._saved_maps.popitem(last=False)
+
+        saved_map_data = DreameVacuumMapDecoder.copy_saved_map(saved_map_data)
+        if saved_map_data.rotation is None:
+            saved_map_data.rotation = rotation
+        return saved_map_data
+
+    @staticmethod
+    def copy_segments(segments: dict[int, Segment] | None) -> dict[int, Segment] | None:
+        if segments is None:
+            return None
+
+        new_segments = {}
+        for (k, v) in segments.items():
+            segment = copy.copy(v)
+            if v.neighbors is not None:
+                segment.neighbors = list(v.neighbors)
+            new_segments[k] = segment
+        return new_segments
+
+    @staticmethod
+    def copy_saved_map(saved_map_data: MapData) -> MapData:
+        """Cheap copy of a decoded saved map that only copies the fields which are modified in place by the callers"""
+        # Cleanset and segments are edited in place by the editor, dimensions are updated by the renderer.
+        # Pixel buffers are read only, restriction, path, obstacle and active area lists are always replaced instead of modified
+        # and name, rotation and timestamps are reassigned so they are shared with the memoized saved map.
+        map_data = copy.copy(saved_map_data)
+        map_data.cleanset = copy.deepcopy(saved_map_data.cleanset)
+        map_data.segments = DreameVacuumMapDecoder.copy_segments(saved_map_data.segments)
+        if saved_map_data.dimensions is not None:
+            map_data.dimensions = copy.copy(saved_map_data.dimensions)
+        # Copies are modified by the callers
+        map_data.update_versions()
+        return map_data
 
     @staticmethod
     def decode_map_data_from_partial(
@@ -2147,33 +2496,7 @@ class DreameVacuumMapDecoder:
             map_data.index = 0
 
         if data_json.get("tr"):
-            matches = [
-                m.groupdict()
-                for m in re.compile(
-                    r"(?P<operator>[MWSLl])(?P<x>-?\d+),(?P<y>-?\d+)"
-                ).finditer(data_json["tr"])
-            ]
-            current_position = Point(0, 0)
-            map_data.path = []
-            for match in matches:
-                operator = match["operator"]
-                x = int(match["x"])
-                y = int(match["y"])
-
-                if operator == "L":
-                    current_position = Path(
-                        current_position.x + x,
-                        current_position.y + y,
-                        PathType.LINE
-                    )
-                else:
-                    # You will only get "l" paths with in a P frame.
-                    # It means path is connected with the path from previous frame and it should be rendered as a line.
-                    if operator == "l":
-                        operator = "L"
-                    current_position = Path(x, y, PathType(operator))
-
-                map_data.path.append(current_position)
+            map_data.path = PathList.from_string(data_json["tr"])
 
         if data_json.get("sa") and isinstance(data_json["sa"], list):
             map_data.active_segments = [sa[0] for sa in data_json["sa"]]
@@ -2222,116 +2545,54 @@ class DreameVacuumMapDecoder:
 
         map_data.empty_map = map_data.frame_type == MapFrameType.I.value
         if (width * height) > 0:
-            map_data.data = raw[DreameVacuumMapDecoder.HEADER_SIZE:image_size]
-            map_data.empty_map = bool(width == 2 and height == 2)
-            if map_data.empty_map:
-                for y in range(height):
-                    for x in range(width):
-                        if map_data.data[(width * y) + x] > 0:
-                            map_data.empty_map = False
-                            break
+            map_data.data = np.frombuffer(
+                raw, dtype=np.uint8, count=width * height, offset=DreameVacuumMapDecoder.HEADER_SIZE
+            )
+            pixels = map_data.data.reshape(height, width)
+            map_data.empty_map = bool(width == 2 and height == 2 and not pixels.any())
+
+            if not map_data.empty_map and map_data.frame_type == MapFrameType.I.value:
+                if map_data.frame_map:
+                    pixel_types = DreameVacuumMapDecoder.FRAME_MAP_PIXEL_TYPES
+                elif (
+                    map_data.saved_map_status == 1
+                    or map_data.saved_map_status == 0
+                ):
+                    pixel_types = DreameVacuumMapDecoder.NEW_MAP_PIXEL_TYPES
+                elif vslam_map and not map_data.saved_map:
+                    pixel_types = DreameVacuumMapDecoder.VSLAM_MAP_PIXEL_TYPES
+                else:
+                    pixel_types = DreameVacuumMapDecoder.MAP_PIXEL_TYPES
 
-            map_data.pixel_type = np.full(
-                (width, height), MapPixelType.OUTSIDE.value, dtype=np.uint8)
-            if not map_data.empty_map:
-                if map_data.frame_type == MapFrameType.I.value:
-                    if map_data.frame_map:
-                        for y in range(height):
-                            for x in range(width):
-                                pixel = map_data.data[(width * y) + x]
-                                if pixel > 0:
-                                    map_data.empty_map = False
-                                    segment_id = pixel >> 2
-                                    if 0 < segment_id < 64:
-                                        if segment_id == 63:
-                                            map_data.pixel_type[x,
-                                                                y] = MapPixelType.WALL.value
-                                        elif segment_id == 62:
-                                            map_data.pixel_type[x,
-                                                                y] = MapPixelType.FLOOR.value
-                                        elif segment_id == 61:
-                                            map_data.pixel_type[x,
-                                                                y] = MapPixelType.UNKNOWN.value
-                                        else:
-                                            map_data.pixel_type[x,
-                                                                y] = segment_id
-                                    else:
-                                        segment_id = pixel & 0x3f
-                                        if segment_id == 1 or segment_id == 3:
-                                            map_data.pixel_type[x,
-                                                                y] = MapPixelType.NEW_SEGMENT.value
-                                        elif segment_id == 2:
-                                            map_data.pixel_type[x,
-                                                                y] = MapPixelType.WALL.value
-                    elif (
-                        map_data.saved_map_status == 1
-                        or map_data.saved_map_status == 0
-                    ):
-                        for y in range(height):
-                            for x in range(width):
-                                segment_id = map_data.data[(
-                                    width * y) + x] & 0x3f
-                                # as implemented on the app
-                                if segment_id == 1 or segment_id == 3:
-                                    map_data.empty_map = False
-                                    map_data.pixel_type[x,
-                                                        y] = MapPixelType.NEW_SEGMENT.value
-                                elif segment_id == 2:
-                                    map_data.empty_map = False
-                                    map_data.pixel_type[x,
-                                                        y] = MapPixelType.WALL.value
-                    elif vslam_map and not map_data.saved_map:
-                        for y in range(height):
-                            for x in range(width):
-                                segment_id = map_data.data[(width * y) + x] & 0b00000011
-                                if segment_id == 1:
-                                    map_data.empty_map = False
-                                    map_data.pixel_type[x,
-                                                        y] = MapPixelType.NEW_SEGMENT.value
-                                elif segment_id == 3:
-                                    map_data.empty_map = False
-                                    map_data.pixel_type[x,
-                                                        y] = MapPixelType.NEW_SEGMENT_UNKNOWN.value
-                                elif segment_id == 2:                                        
-                                    map_data.empty_map = False
-                                    map_data.pixel_type[x,
-                                                        y] = MapPixelType.WALL.value
-                    else:
-                        for y in range(height):
-                            for x in range(width):
-                                pixel = map_data.data[(width * y) + x]
-                                if pixel > 0:
-                                    map_data.empty_map = False
-                                    if pixel >> 7:
-                                        map_data.pixel_type[x,
-                                                            y] = MapPixelType.WALL.value
-                                    else:
-                                        segment_id = pixel & 0x3f
-                                        if segment_id > 0:
-                                            map_data.pixel_type[x,
-                                                                y] = segment_id
+                # Pixel type array is indexed as [x, y]
+                map_data.pixel_type = np.ascontiguousarray(pixel_types[pixels].T)
 
+                segments = {}
+                if np.any((map_data.pixel_type > 0) & (map_data.pixel_type < 64)):
                     segments = DreameVacuumMapDecoder.get_segments(map_data, vslam_map)
-                    if segments and data_json.get("seg_inf"):
-                        seg_inf = data_json["seg_inf"]
-                        for (k, v) in segments.items():
-                            if seg_inf.get(str(k)):
-                                segment_info = seg_inf[str(k)]
-                                if segment_info.get("nei_id"):
-                                    segments[k].neighbors = segment_info["nei_id"]
-                                if segment_info.get("type"):
-                                    segments[k].type = segment_info["type"]
-                                if segment_info.get("index"):
-                                    segments[k].index = segment_info["index"]
-                                if segment_info.get("roomID"):
-                                    segments[k].unique_id = segment_info["roomID"]
-                                if segment_info.get(MAP_PARAMETER_NAME):
-                                    segments[k].custom_name = base64.b64decode(
-                                        segment_info.get(MAP_PARAMETER_NAME)
-                                    ).decode("utf-8")
-                                segments[k].set_name()
-
-                    map_data.segments = segments
+                if segments and data_json.get("seg_inf"):
+                    seg_inf = data_json["seg_inf"]
+                    for (k, v) in segments.items():
+                        if seg_inf.get(str(k)):
+                            segment_info = seg_inf[str(k)]
+                            if segment_info.get("nei_id"):
+                                segments[k].neighbors = segment_info["nei_id"]
+                            if segment_info.get("type"):
+                                segments[k].type = segment_info["type"]
+                            if segment_info.get("index"):
+                                segments[k].index = segment_info["index"]
+                            if segment_info.get("roomID"):
+                                segments[k].unique_id = segment_info["roomID"]
+                            if segment_info.get(MAP_PARAMETER_NAME):
+                                segments[k].custom_name = base64.b64decode(
+                                    segment_info.get(MAP_PARAMETER_NAME)
+                                ).decode("utf-8")
+                            segments[k].set_name()
+
+                map_data.segments = segments
+            else:
+                map_data.pixel_type = np.full(
+                    (width, height), MapPixelType.OUTSIDE.value, dtype=np.uint8)
 
         saved_map_data = None
         restored_map = map_data.restored_map
@@ -2350,7 +2611,7 @@ class DreameVacuumMapDecoder:
                     map_data.temporary_map = saved_map_data.temporary_map
 
                 if restored_map or map_data.recovery_map or (map_data.saved_map_status == 2 and map_data.empty_map):
-                    map_data.segments = copy.deepcopy(saved_map_data.segments)
+                    map_data.segments = DreameVacuumMapDecoder.copy_segments(saved_map_data.segments)
                     map_data.data = saved_map_data.data
                     map_data.pixel_type = saved_map_data.pixel_type
                     map_data.dimensions = saved_map_data.dimensions
@@ -2398,7 +2659,7 @@ class DreameVacuumMapDecoder:
                     map_data.walls = saved_map_data.walls
 
                     if vslam_map:
-                        map_data.segments = copy.deepcopy(saved_map_data.segments)
+                        map_data.segments = DreameVacuumMapDecoder.copy_segments(saved_map_data.segments)
                         map_data.charger_position = copy.deepcopy(saved_map_data.charger_position)
 
         if (
@@ -2485,6 +2746,8 @@ class DreameVacuumMapDecoder:
         if map_data is None:
             return None
 
+        # Previous map data can still be used by the renderers, new frame is applied to a copy that shares the unchanged buffers
+        current_map_data = copy.copy(current_map_data)
         current_map_data.frame_id = map_data.frame_id
         current_map_data.robot_position = map_data.robot_position
         current_map_data.timestamp_ms = map_data.timestamp_ms
@@ -2504,7 +2767,7 @@ class DreameVacuumMapDecoder:
 
         # P map only returns difference between its previous frame.
         # Calculate new map size and update the buffer according to the received data at received offset.
-        if map_data.data:
+        if map_data.data is not None and len(map_data.data):
             current_dimensions = current_map_data.dimensions
             new_dimensions = map_data.dimensions
 
@@ -2528,7 +2791,7 @@ class DreameVacuumMapDecoder:
             height = int((max_top - top) / grid_size)
 
             # Create new buffer
-            data = np.zeros((width * height), np.uint8)
+            data = np.zeros((height, width), np.uint8)
             pixel_type = np.full(
                 (width, height), MapPixelType.OUTSIDE.value, dtype=np.uint8)
 
@@ -2541,52 +2804,94 @@ class DreameVacuumMapDecoder:
             )
 
             # Copy old image to buffer
-            for y in range(current_dimensions.height):
-                for x in range(current_dimensions.width):
-                    data[
-                        (width * (top_offset + y)) + left_offset + x
-                    ] = current_map_data.data[(current_dimensions.width * y) + x]
-                    pixel_type[
-                        left_offset + x, top_offset + y
-                    ] = current_map_data.pixel_type[x, y]
+            if current_map_data.data is not None and len(current_map_data.data):
+                data[
+                    top_offset:top_offset + current_dimensions.height,
+                    left_offset:left_offset + current_dimensions.width,
+                ] = np.frombuffer(current_map_data.data, dtype=np.uint8).reshape(
+                    current_dimensions.height, current_dimensions.width
+                )
+                pixel_type[
+                    left_offset:left_offset + current_dimensions.width,
+                    top_offset:top_offset + current_dimensions.height,
+                ] = current_map_data.pixel_type
 
             # Calculate new image offset
             left_offset = int((new_dimensions.left - left) / grid_size)
             top_offset = int((new_dimensions.top - top) / grid_size)
 
-            # Copy new image to buffer at calculated offset
-            for y in range(new_dimensions.height):
-                for x in range(new_dimensions.width):
-                    current_index = (new_dimensions.width * y) + x
-                    if map_data.data[current_index]:
-                        new_index = (width * (top_offset + y)) + \
-                            left_offset + x
-                        # Add current buffer value to new buffer value for finding the new pixel value
-                        data[new_index] = data[new_index] + \
-                            map_data.data[current_index]
-                        # Calculate the new pixel type from updated buffer value
-                        pixel_type[
-                            left_offset + x, top_offset + y
-                        ] = DreameVacuumMapDecoder._get_pixel_type(
-                            current_map_data, int(data[new_index]), vslam_map,
-                        )
+            # Add new image to buffer at calculated offset for finding the new pixel values
+            new_data = np.frombuffer(map_data.data, dtype=np.uint8).reshape(
+                new_dimensions.height, new_dimensions.width
+            )
+            changed = new_data != 0
+            region = data[
+                top_offset:top_offset + new_dimensions.height,
+                left_offset:left_offset + new_dimensions.width,
+            ]
+            region[changed] += new_data[changed]
+
+            # Calculate the new pixel types of changed pixels from updated buffer values
+            pixel_type[
+                left_offset:left_offset + new_dimensions.width,
+                top_offset:top_offset + new_dimensions.height,
+            ][changed.T] = DreameVacuumMapDecoder._get_pixel_types(
+                current_map_data, vslam_map
+            )[region.T[changed.T]]
 
             # Update size and buffer
-            current_map_data.data = bytes(data)
+            data.setflags(write=False)
+            pixel_type.setflags(write=False)
+            current_map_data.data = data.reshape(-1)
             current_map_data.pixel_type = pixel_type
             current_map_data.dimensions = MapImageDimensions(
                 top, left, height, width, grid_size
             )
 
+            if current_map_data.dimensions != current_dimensions:
+                current_map_data.set_changed("data", "dimensions")
+                current_map_data.changed_pixels = None
+            else:
+                rows = np.flatnonzero(changed.any(axis=1))
+                if rows.size:
+                    # Keep the changed pixel area for renderers to update only that part of their images
+                    columns = np.flatnonzero(changed.any(axis=0))
+                    area = [
+                        left_offset + int(columns[0]),
+                        top_offset + int(rows[0]),
+                        left_offset + int(columns[-1]) + 1,
+                        top_offset + int(rows[-1]) + 1,
+                    ]
+                    changed_pixels = {}
+                    if (
+                        current_map_data.changed_pixels
+                        and current_map_data.changed_pixels_version == current_map_data.pixels_version
+                    ):
+                        for version, a in list(current_map_data.changed_pixels.items())[
+                            -(DreameVacuumMapDecoder.CHANGED_PIXELS_HISTORY - 1):
+                        ]:
+                            changed_pixels[version] = [
+                                min(a[0], area[0]),
+                                min(a[1], area[1]),
+                                max(a[2], area[2]),
+                                max(a[3], area[3]),
+                            ]
+                    changed_pixels[current_map_data.pixels_version] = area
+                    current_map_data.set_changed("data")
+                    current_map_data.changed_pixels = changed_pixels
+                    current_map_data.changed_pixels_version = current_map_data.pixels_version
+
             if vslam_map:
                 current_map_data.need_optimization = True
 
         if map_data.path:
             # Append new paths received with P frame
             if current_map_data.path:
+                current_map_data.path = copy.copy(current_map_data.path)
                 current_map_data.path.extend(map_data.path)
             else:
                 current_map_data.path = map_data.path
+            current_map_data.set_changed("path")
 
         DreameVacuumMapDecoder.set_robot_segment(current_map_data)
 
@@ -2596,26 +2901,36 @@ class DreameVacuumMapDecoder:
         #    self._lastPos = None
         return current_map_data
 
+    @staticmethod
+    def _get_segment_index(pixel_type) -> dict[int, list[int]]:
+        """Find pixel bounds of every segment on the pixel type array in order of their first appearance"""
+        width = pixel_type.shape[0]
+        values = pixel_type.T.ravel()
+        indexes = np.flatnonzero((values > 0) & (values < 64))
+        if not indexes.size:
+            return {}
+
+        labels = values[indexes]
+        segment_ids, first_indexes, counts = np.unique(labels, return_index=True, return_counts=True)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        xs = (indexes % width)[order]
+        ys = (indexes // width)[order]
+        x0 = np.minimum.reduceat(xs, offsets)
+        y0 = np.minimum.reduceat(ys, offsets)
+        x1 = np.maximum.reduceat(xs, offsets)
+        y1 = np.maximum.reduceat(ys, offsets)
+
+        return {
+            int(segment_ids[i]): [int(x0[i]), int(y0[i]), int(x1[i]), int(y1[i])]
+            for i in np.argsort(first_indexes)
+        }
+
     @staticmethod
     def get_segments(map_data: MapData, vslam_map: bool) -> dict[str, Any]:
         segments = {}
-        for y in range(map_data.dimensions.height):
-            for x in range(map_data.dimensions.width):
-                segment_id = int(map_data.pixel_type[x, y])
-                if segment_id > 0 and segment_id < 64:
-                    if segment_id not in segments:
-                        segments[segment_id] = Segment(segment_id, x, y, x, y)
-                        continue
-
-                    if x < segments[segment_id].x0:
-                        segments[segment_id].x0 = x
-                    elif x > segments[segment_id].x1:
-                        segments[segment_id].x1 = x
-
-                    if y < segments[segment_id].y0:
-                        segments[segment_id].y0 = y
-                    elif y > segments[segment_id].y1:
-                        segments[segment_id].y1 = y
+        for (segment_id, bounds) in DreameVacuumMapDecoder._get_segment_index(map_data.pixel_type).items():
+            segments[segment_id] = Segment(segment_id, *bounds)
 
         if segments:
             for (k, v) in segments.items():
@@ -2625,19 +2940,13 @@ class DreameVacuumMapDecoder:
                 if map_data.saved_map:                
                     if vslam_map:
                         if map_data.pixel_type[x, y] != k:
-                            startI = -1
-                            endI = -1
-                            for i in range(map_data.dimensions.width):
-                                value = map_data.pixel_type[i, y]
-                                if startI == -1:
-                                    if value == k:
-                                        startI = i
-                                elif value != k or i == (map_data.dimensions.width - 1):
-                                    endI = (i - 1)
-                                    break
-
-                            if startI != -1 and endI != -1:
-                                x = (endI - startI) + startI
+                            line = map_data.pixel_type[:, y] == k
+                            start = np.flatnonzero(line)
+                            if start.size and start[0] < map_data.dimensions.width - 1:
+                                start = int(start[0])
+                                end = np.flatnonzero(~line[start + 1:])
+                                end = (start + 1 + int(end[0])) if end.size else (map_data.dimensions.width - 1)
+                                x = min(end, map_data.dimensions.width - 1) - 1
                     else:
                         center_x = DreameVacuumMapDecoder._get_segment_center(
                             map_data, k, y, False
@@ -2782,8 +3091,11 @@ class DreameVacuumMapDataRenderer:
     HALF_INT16 = 32768
     HALF_INT16_UPPER_HALF = 32767
     MAX = round(((HALF_INT16 + HALF_INT16_UPPER_HALF) / 10))
+    VERSION = 3  # Increase when the rendered output changes to invalidate the persisted images
 
-    def __init__(self) -> None:
+    def __init__(self, render_profile: str = None) -> None:
+        self.profile: MapRendererProfile = MAP_RENDER_PROFILE_LIST.get(
+            render_profile, MapRendererProfile())
         self._map_data: MapData = None
         self._map_data_json: dict[str, Any] = None
         self._left: int = 0
@@ -2818,6 +3130,20 @@ class DreameVacuumMapDataRenderer:
             - round((y + DreameVacuumMapDataRenderer.HALF_INT16) / 10),
         ]
 
+    @staticmethod
+    def _get_path_points(path: PathList, start: int = 1, tolerance: float = 0) -> list[list[int]]:
+        # Line coordinates from the previous point to every point after start, every point that is not a line starts a new path entity
+        path = path[start - 1:].simplify(tolerance)
+        x = np.round((path.x + DreameVacuumMapDataRenderer.HALF_INT16) / 10).astype(np.int64)
+        y = DreameVacuumMapDataRenderer.MAX - \
+            np.round((path.y + DreameVacuumMapDataRenderer.HALF_INT16) / 10).astype(np.int64)
+        lines = np.stack((x[:-1], y[:-1], x[1:], y[1:]), axis=1)
+
+        starts = np.flatnonzero(~path[1:].is_type(PathType.LINE))
+        return [
+            lines[s:e].ravel().tolist() for (s, e) in zip(np.concatenate(([0], starts + 1)), np.append(starts, len(lines)))
+        ]
+
     @staticmethod
     def _convert_angle(angle: int) -> int:
         return (((180 - angle) if (angle < 180) else (360 - angle + 180)) + 270) % 360
@@ -2837,7 +3163,7 @@ class DreameVacuumMapDataRenderer:
         if (
             self._map_data
             and self._map_data == map_data
-            and self._map_data.segments == map_data.segments
+            and not map_data.changed(self._map_data, "segments")
             and self._map_data.frame_id == map_data.frame_id
             and self._map_data_json
         ):
@@ -2920,7 +3246,7 @@ class DreameVacuumMapDataRenderer:
         if map_data.no_mopping_areas:
             if (
                 self._map_data is None
-                or self._map_data.no_mopping_areas != map_data.no_mopping_areas
+                or map_data.changed(self._map_data, "no_mopping_areas")
                 or not self._layers.get(MapRendererLayer.NO_MOP)
             ):
                 self._layers[MapRendererLayer.NO_MOP] = []
@@ -2949,7 +3275,7 @@ class DreameVacuumMapDataRenderer:
         if map_data.no_go_areas:
             if (
                 self._map_data is None
-                or self._map_data.no_go_areas != map_data.no_go_areas
+                or map_data.changed(self._map_data, "no_go_areas")
                 or not self._layers.get(MapRendererLayer.NO_GO)
             ):
                 self._layers[MapRendererLayer.NO_GO] = []
@@ -3041,7 +3367,7 @@ class DreameVacuumMapDataRenderer:
                 self._layers[MapRendererLayer.ACTIVE_POINT])
 
         if map_data.walls:
-            if self._map_data is None or self._map_data.walls != map_data.walls or not self._layers.get(MapRendererLayer.WALL):
+            if self._map_data is None or map_data.changed(self._map_data, "walls") or not self._layers.get(MapRendererLayer.WALL):
                 self._layers[MapRendererLayer.WALL] = []
                 for wall in map_data.walls:
                     a = DreameVacuumMapDataRenderer._convert_coordinates(
@@ -3060,36 +3386,49 @@ class DreameVacuumMapDataRenderer:
             map_data_json[MAP_DATA_PARAMETER_ENTITIES].extend(
                 self._layers[MapRendererLayer.WALL])
 
-        if self._map_data is None or len(self._map_data.path) != len(map_data.path) or not self._layers.get(MapRendererLayer.PATH):
-            points = []
+        if (
+            self._map_data is not None
+            and self._layers.get(MapRendererLayer.PATH)
+            and self._map_data.path
+            and len(self._map_data.path) > 1
+            and map_data.path
+            and len(map_data.path) > len(self._map_data.path)
+            and map_data.path.starts_with(self._map_data.path)
+        ):
+            # Path is only appended with P frames, extend the last path entity and add the new ones
+            points = DreameVacuumMapDataRenderer._get_path_points(
+                map_data.path, len(self._map_data.path), map_data.dimensions.grid_size * self.profile.data_path_tolerance
+            )
+            self._layers[MapRendererLayer.PATH][-1] = {
+                MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
+                MAP_DATA_PARAMETER_POINTS: self._layers[MapRendererLayer.PATH][-1][MAP_DATA_PARAMETER_POINTS] + points[0],
+            }
+            for p in points[1:]:
+                self._layers[MapRendererLayer.PATH].append(
+                    {
+                        MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
+                        MAP_DATA_PARAMETER_POINTS: p,
+                    }
+                )
+        elif self._map_data is None or len(self._map_data.path) != len(map_data.path) or not self._layers.get(MapRendererLayer.PATH):
             self._layers[MapRendererLayer.PATH] = []
             if map_data.path and len(map_data.path) > 1:
-                s = map_data.path[0]
-                for point in map_data.path[1:]:
-                    if point.path_type == PathType.LINE:
-                        point = point
-                        a = DreameVacuumMapDataRenderer._convert_coordinates(
-                            s.x, s.y)
-                        b = DreameVacuumMapDataRenderer._convert_coordinates(
-                            point.x, point.y
-                        )
-
-                        points.extend([a[0], a[1], b[0], b[1]])
-                    else:
-                        self._layers[MapRendererLayer.PATH].append(
-                            {
-                                MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
-                                MAP_DATA_PARAMETER_POINTS: points,
-                            }
-                        )
-                        points = []
-                    s = point
-            self._layers[MapRendererLayer.PATH].append(
-                {
-                    MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
-                    MAP_DATA_PARAMETER_POINTS: points,
-                }
-            )
+                for p in DreameVacuumMapDataRenderer._get_path_points(
+                    map_data.path, 1, map_data.dimensions.grid_size * self.profile.data_path_tolerance
+                ):
+                    self._layers[MapRendererLayer.PATH].append(
+                        {
+                            MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
+                            MAP_DATA_PARAMETER_POINTS: p,
+                        }
+                    )
+            else:
+                self._layers[MapRendererLayer.PATH].append(
+                    {
+                        MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
+                        MAP_DATA_PARAMETER_POINTS: [],
+                    }
+                )
         map_data_json[MAP_DATA_PARAMETER_ENTITIES].extend(
             self._layers[MapRendererLayer.PATH])
 
@@ -3101,8 +3440,8 @@ class DreameVacuumMapDataRenderer:
             self._map_data is None
             or self._map_data.active_segments != map_data.active_segments
             or self._map_data.active_areas != map_data.active_areas
-            or self._map_data.segments != map_data.segments
-            or self._map_data.data != map_data.data
+            or map_data.changed(self._map_data, "segments")
+            or map_data.changed(self._map_data, "data")
             or not self._layers.get(MapRendererLayer.IMAGE)
         ):
             self._layers[MapRendererLayer.IMAGE] = []
@@ -3313,10 +3652,16 @@ class DreameVacuumMapDataRenderer:
 
 
 class DreameVacuumMapRenderer:
-    def __init__(self, color_scheme: str = None, icon_set: str = None, map_objects: list[str] = None, robot_shape: int = 0) -> None:
+    VERSION = 2  # Increase when the rendered output changes to invalidate the persisted images
+
+    def __init__(self, color_scheme: str = None, icon_set: str = None, map_objects: list[str] = None, robot_shape: int = 0, render_profile: str = None) -> None:
         self.color_scheme: MapRendererColorScheme = MAP_COLOR_SCHEME_LIST.get(
             color_scheme, MapRendererColorScheme())
         self.icon_set: int = MAP_ICON_SET_LIST.get(icon_set, 0)
+        self.profile: MapRendererProfile = MAP_RENDER_PROFILE_LIST.get(
+            render_profile, MapRendererProfile())
+        self._resample = Image.Resampling[self.profile.resample]
+        self._icon_resample = Image.Resampling[self.profile.icon_resample]
         self.config: MapRendererConfig = MapRendererConfig()
         if map_objects is not None:
             for attr in self.config.__dict__.keys():
@@ -3339,6 +3684,10 @@ class DreameVacuumMapRenderer:
         ]
 
         self._image = None
+        self._composite = None
+        self._composite_layers = None
+        self._layer_boxes = {}
+        self._robot_area = None
         self._charger_icon = None
         self._robot_icon = None
         self._robot_charging_icon = None
@@ -3545,6 +3894,16 @@ class DreameVacuumMapRenderer:
                 )
             return calibration_points
 
+    @staticmethod
+    def render_map_process(
+        color_scheme: str, icon_set: str, map_objects: list[str], robot_shape: int, render_profile: str, map_data: MapData, robot_status: int = 0
+    ) -> tuple[bytes, dict[str, int]]:
+        """Renders the map with a new renderer, used for rendering saved maps on a process pool where the renderer can not be shared with the camera.
+        Saved maps are always rendered fully so there is nothing to be gained from keeping the renderer between the calls."""
+        renderer = DreameVacuumMapRenderer(color_scheme, icon_set, map_objects, robot_shape, render_profile)
+        image = renderer.render_map(map_data, robot_status)
+        return image, renderer.calibration_points
+
     def render_map(self, map_data: MapData, robot_status: int = 0) -> bytes:
         if map_data is None or map_data.empty_map or (map_data.dimensions.width * map_data.dimensions.height) < 2:
             return self.default_map_image
@@ -3567,7 +3926,7 @@ class DreameVacuumMapRenderer:
                 self._map_data
                 and self._map_data == map_data
                 and self._robot_status == robot_status
-                and self._map_data.segments == map_data.segments
+                and not map_data.changed(self._map_data, "segments")
                 and self._map_data.frame_id == map_data.frame_id
                 and self._image 
             ):
@@ -3575,12 +3934,12 @@ class DreameVacuumMapRenderer:
                 _LOGGER.info("Skip render frame, map data not changed")
                 return self._to_buffer(self._image)
 
-            scale = 4 if map_data.saved_map_status == 2 or map_data.saved_map else 3
+            scale = self.profile.saved_map_scale if map_data.saved_map_status == 2 or map_data.saved_map else self.profile.scale
 
             if not map_data.saved_map:
                 if (
                     self._map_data is None
-                    or self._map_data.segments != map_data.segments
+                    or map_data.changed(self._map_data, "segments")
                     or self._map_data.dimensions != map_data.dimensions
                 ):
                     map_data.dimensions.bounds = DreameVacuumMapRenderer._calculate_bounds(
@@ -3596,10 +3955,7 @@ class DreameVacuumMapRenderer:
             if (
                 self._map_data is None
                 or self._map_data.active_areas != map_data.active_areas
-                or self._map_data.no_mopping_areas != map_data.no_mopping_areas
-                or self._map_data.no_go_areas != map_data.no_go_areas
-                or self._map_data.walls != map_data.walls
-                or self._map_data.segments != map_data.segments
+                or map_data.changed(self._map_data, "no_mopping_areas", "no_go_areas", "walls", "segments")
                 or self._map_data.dimensions != map_data.dimensions
                 or self._map_data.restored_map != map_data.restored_map
             ):
@@ -3641,62 +3997,30 @@ class DreameVacuumMapRenderer:
                     self._robot_washing_icon = None
                     self._robot_cleaning_direction_icon = None
 
+            image_area = None
             if (
                 self._map_data is None
                 or not self._layers.get(MapRendererLayer.IMAGE)
-                or self._map_data.active_segments != map_data.active_segments
-                or self._map_data.active_areas != map_data.active_areas
-                or self._map_data.segments != map_data.segments
-                or self._map_data.data != map_data.data
+                or map_data.changed(self._map_data, "segments")
+                or map_data.changed(self._map_data, "data")
             ):
-                area_colors = {}
-                # as implemented on the app
-                area_colors[MapPixelType.OUTSIDE.value] = self.color_scheme.outside
-                area_colors[MapPixelType.WALL.value] = self.color_scheme.wall
-                area_colors[MapPixelType.FLOOR.value] = self.color_scheme.floor
-                area_colors[MapPixelType.NEW_SEGMENT.value] = self.color_scheme.new_segment
-                area_colors[MapPixelType.UNKNOWN.value] = self.color_scheme.floor
-                area_colors[MapPixelType.OBSTACLE_WALL.value] = self.color_scheme.wall
-                area_colors[MapPixelType.NEW_SEGMENT_UNKNOWN.value] = self.color_scheme.new_segment
-                
-                if map_data.segments is not None:
-                    for (k, v) in map_data.segments.items():
-                        if self.config.color:
-                            if map_data.active_segments and k not in map_data.active_segments:
-                                area_colors[k] = self.color_scheme.passive_segment
-                            elif v.color_index is not None:
-                                area_colors[k] = self.color_scheme.segment[
-                                    v.color_index
-                                ][0]
-                        else:
-                            area_colors[k] = area_colors[MapPixelType.FLOOR.value]
-
-                pixels = np.full(
-                    (
-                        map_data.dimensions.height,
-                        map_data.dimensions.width,
-                        4,
-                    ),
-                    area_colors[MapPixelType.OUTSIDE.value],
-                    dtype=np.uint8,
-                )
+                # Pixel type is indexed by [x, y] from bottom, image rows are from top
+                pixels = map_data.pixel_type.T[::-1]
+
+                mask = pixels != MapPixelType.OUTSIDE.value
+                rows = np.flatnonzero(mask.any(axis=1))
+                columns = np.flatnonzero(mask.any(axis=0))
+                if rows.size:
+                    min_x = int(columns[0])
+                    min_y = int(rows[0])
+                    max_x = int(columns[-1])
+                    max_y = int(rows[-1])
+                else:
+                    min_x = map_data.dimensions.width - 1
+                    min_y = map_data.dimensions.height - 1
+                    max_x = 0
+                    max_y = 0
 
-                min_x = map_data.dimensions.width - 1
-                min_y = map_data.dimensions.height - 1
-                max_x = 0
-                max_y = 0
-                for y in range(map_data.dimensions.height):
-                    for x in range(map_data.dimensions.width):
-                        px_type = int(
-                            map_data.pixel_type[x, map_data.dimensions.height - y - 1])
-                        if px_type != MapPixelType.OUTSIDE.value:
-                            pixels[y, x] = area_colors[px_type] if px_type in area_colors else area_colors[MapPixelType.NEW_SEGMENT.value]
-
-                            max_x = max(x, max_x)
-                            min_x = min(x, min_x)
-                            max_y = max(y, max_y)
-                            min_y = min(y, min_y)        
-                                
                 if map_data.dimensions.bounds:
                     #min_x = max(0, min(map_data.dimensions.bounds[0], min_x))
                     #max_x = min((map_data.dimensions.width - 1), max(map_data.dimensions.bounds[2], max_x))
@@ -3707,6 +4031,8 @@ class DreameVacuumMapRenderer:
                     min_y = max(min(map_data.dimensions.bounds[1], min_y), min_y)
                     max_y = min(max(map_data.dimensions.bounds[3], max_y), max_y)
 
+                crop_x = 0
+                crop_y = 0
                 if (
                     (
                         min_x != (map_data.dimensions.width - 1) and
@@ -3724,18 +4050,62 @@ class DreameVacuumMapRenderer:
                     map_data.dimensions.crop = [min_x * scale, min_y * scale, (map_data.dimensions.width - (
                         max_x + 1)) * scale, (map_data.dimensions.height - (max_y + 1)) * scale]
                     pixels = pixels[min_y:(max_y + 1), min_x:(max_x + 1)]
+                    crop_x = min_x
+                    crop_y = min_y
                         
                 if self._map_data and self._map_data.dimensions.crop != map_data.dimensions.crop:
                     self._map_data = None
 
-                self._layers[MapRendererLayer.IMAGE] = ImageOps.expand(
-                    Image.fromarray(pixels.repeat(
-                        scale, axis=0).repeat(scale, axis=1)),
-                    border=tuple(map_data.dimensions.padding)
-                )
+                area = None
+                if (
+                    self._map_data
+                    and self._layers.get(MapRendererLayer.IMAGE)
+                    and not map_data.changed(self._map_data, "segments")
+                ):
+                    area = map_data.changed_area(self._map_data)
+
+                if area is not None:
+                    # Only the pixels in changed area are updated on the cached images
+                    x0 = max(area[0] - crop_x, 0)
+                    x1 = min(area[2] - crop_x, pixels.shape[1])
+                    y0 = max(map_data.dimensions.height - area[3] - crop_y, 0)
+                    y1 = min(map_data.dimensions.height - area[1] - crop_y, pixels.shape[0])
+                    if x1 > x0 and y1 > y0:
+                        image = Image.frombytes("P", (x1 - x0, y1 - y0), pixels[y0:y1, x0:x1].tobytes())
+                        box = (
+                            map_data.dimensions.padding[0] + x0 * scale,
+                            map_data.dimensions.padding[1] + y0 * scale,
+                            map_data.dimensions.padding[0] + x1 * scale,
+                            map_data.dimensions.padding[1] + y1 * scale,
+                        )
+                        self._layers[MapRendererLayer.PIXELS].paste(
+                            image.resize((image.size[0] * scale, image.size[1] * scale), Image.Resampling.NEAREST),
+                            box
+                        )
+                        self._layers[MapRendererLayer.IMAGE].paste(
+                            self._layers[MapRendererLayer.PIXELS].crop(box).convert("RGBA"),
+                            box
+                        )
+                        image_area = box
+                else:
+                    # Pixel types are kept as a palette image, colors are only applied with the palette
+                    image = Image.frombytes("P", (pixels.shape[1], pixels.shape[0]), pixels.tobytes())
+                    self._layers[MapRendererLayer.PIXELS] = ImageOps.expand(
+                        image.resize((image.size[0] * scale, image.size[1] * scale), Image.Resampling.NEAREST),
+                        border=tuple(map_data.dimensions.padding)
+                    )
+                    self._layers[MapRendererLayer.IMAGE] = None
             else:
                 map_data.dimensions.crop = self._map_data.dimensions.crop
 
+            if (
+                not self._layers.get(MapRendererLayer.IMAGE)
+                or self._map_data.active_segments != map_data.active_segments
+                or self._map_data.active_areas != map_data.active_areas
+            ):
+                self._layers[MapRendererLayer.PIXELS].putpalette(self._get_palette(map_data), "RGBA")
+                self._layers[MapRendererLayer.IMAGE] = self._layers[MapRendererLayer.PIXELS].convert("RGBA")
+
             self._calibration_points = self._calculate_calibration_points(
                 map_data)
 
@@ -3743,7 +4113,8 @@ class DreameVacuumMapRenderer:
                 map_data,
                 robot_status,
                 self._layers[MapRendererLayer.IMAGE],
-                2,
+                self.profile.supersampling,
+                image_area,
             )
 
             if map_data.rotation == 90:
@@ -3769,12 +4140,43 @@ class DreameVacuumMapRenderer:
         self.render_complete = True
         return self._to_buffer(self._image)
 
+    def _get_palette(self, map_data: MapData) -> bytes:
+        area_colors = {}
+        # as implemented on the app
+        area_colors[MapPixelType.OUTSIDE.value] = self.color_scheme.outside
+        area_colors[MapPixelType.WALL.value] = self.color_scheme.wall
+        area_colors[MapPixelType.FLOOR.value] = self.color_scheme.floor
+        area_colors[MapPixelType.NEW_SEGMENT.value] = self.color_scheme.new_segment
+        area_colors[MapPixelType.UNKNOWN.value] = self.color_scheme.floor
+        area_colors[MapPixelType.OBSTACLE_WALL.value] = self.color_scheme.wall
+        area_colors[MapPixelType.NEW_SEGMENT_UNKNOWN.value] = self.color_scheme.new_segment
+        
+        if map_data.segments is not None:
+            for (k, v) in map_data.segments.items():
+                if self.config.color:
+                    if map_data.active_segments and k not in map_data.active_segments:
+                        area_colors[k] = self.color_scheme.passive_segment
+                    elif v.color_index is not None:
+                        area_colors[k] = self.color_scheme.segment[
+                            v.color_index
+                        ][0]
+                else:
+                    area_colors[k] = area_colors[MapPixelType.FLOOR.value]
+
+        # Pixel types without a color are drawn as new segment
+        palette = np.full((256, 4), area_colors[MapPixelType.NEW_SEGMENT.value], dtype=np.uint8)
+        for (k, v) in area_colors.items():
+            if 0 <= k < 256:
+                palette[k] = v
+        return palette.tobytes()
+
     def render_objects(
         self,
         map_data,
         robot_status,
         map_image,
         scale,
+        image_area=None,
     ):
         if self._map_data is None or not self._layers.get(MapRendererLayer.OBJECTS):
             self._layers[MapRendererLayer.OBJECTS] = Image.new(
@@ -3784,8 +4186,10 @@ class DreameVacuumMapRenderer:
                 (255, 255, 255, 0),
             )
         layer = self._layers[MapRendererLayer.OBJECTS]
-        layer.paste((255, 255, 255, 0), [
-                    0, 0, layer.size[0], layer.size[1]])
+        # Object layers in drawing order
+        layers = [(MapRendererLayer.IMAGE, map_image)]
+        # Areas of the layers that are updated in place instead of being replaced
+        updated_areas = {}
 
         line_width = 3
         border_width = 2
@@ -3804,8 +4208,35 @@ class DreameVacuumMapRenderer:
             
         if map_data.path and self.config.path:
             if (
+                self._map_data is not None
+                and self._layers.get(MapRendererLayer.PATH)
+                and self._map_data.path
+                and len(map_data.path) > len(self._map_data.path)
+                and map_data.path.starts_with(self._map_data.path)
+            ):
+                # Draw only the points appended with the P frames on top of the previously rendered path
+                path_area = DreameVacuumMapRenderer._get_path_area(
+                    map_data.path[len(self._map_data.path) - 1:],
+                    map_data.dimensions,
+                    line_width,
+                    scale,
+                )
+                path_layer = self._layers[MapRendererLayer.PATH]
+                self._layers[MapRendererLayer.PATH] = self.render_path(
+                    map_data.path,
+                    self.color_scheme.path,
+                    layer,
+                    map_data.dimensions,
+                    line_width,
+                    scale,
+                    len(self._map_data.path),
+                    path_area,
+                )
+                if self._layers[MapRendererLayer.PATH] is path_layer:
+                    updated_areas[MapRendererLayer.PATH] = [path_area]
+            elif (
                 self._map_data is None
-                or self._map_data.path != map_data.path
+                or map_data.changed(self._map_data, "path")
                 or not self._layers.get(MapRendererLayer.PATH)
             ):
                 self._layers[MapRendererLayer.PATH] = self.render_path(
@@ -3816,13 +4247,12 @@ class DreameVacuumMapRenderer:
                     line_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.PATH])
+            layers.append((MapRendererLayer.PATH, self._layers[MapRendererLayer.PATH]))
 
         if map_data.no_mopping_areas and self.config.no_mop:
             if (
                 self._map_data is None
-                or self._map_data.no_mopping_areas != map_data.no_mopping_areas
+                or map_data.changed(self._map_data, "no_mopping_areas")
                 or not self._layers.get(MapRendererLayer.NO_MOP)
             ):
                 self._layers[MapRendererLayer.NO_MOP] = self.render_areas(
@@ -3834,13 +4264,12 @@ class DreameVacuumMapRenderer:
                     border_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.NO_MOP])
+            layers.append((MapRendererLayer.NO_MOP, self._layers[MapRendererLayer.NO_MOP]))
 
         if map_data.no_go_areas and self.config.no_go:
             if (
                 self._map_data is None
-                or self._map_data.no_go_areas != map_data.no_go_areas
+                or map_data.changed(self._map_data, "no_go_areas")
                 or not self._layers.get(MapRendererLayer.NO_GO)
             ):
                 self._layers[MapRendererLayer.NO_GO] = self.render_areas(
@@ -3852,13 +4281,12 @@ class DreameVacuumMapRenderer:
                     border_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.NO_GO])
+            layers.append((MapRendererLayer.NO_GO, self._layers[MapRendererLayer.NO_GO]))
 
         if map_data.walls and self.config.virtual_wall:
             if (
                 self._map_data is None
-                or self._map_data.walls != map_data.walls
+                or map_data.changed(self._map_data, "walls")
                 or not self._layers.get(MapRendererLayer.WALL)
             ):
                 self._layers[MapRendererLayer.WALL] = self.render_walls(
@@ -3869,8 +4297,7 @@ class DreameVacuumMapRenderer:
                     line_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.WALL])
+            layers.append((MapRendererLayer.WALL, self._layers[MapRendererLayer.WALL]))
 
         if map_data.active_areas and self.config.active_area:
             if (
@@ -3887,8 +4314,7 @@ class DreameVacuumMapRenderer:
                     border_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.ACTIVE_AREA])
+            layers.append((MapRendererLayer.ACTIVE_AREA, self._layers[MapRendererLayer.ACTIVE_AREA]))
 
         if map_data.active_points and self.config.active_point:
             if (
@@ -3905,13 +4331,12 @@ class DreameVacuumMapRenderer:
                     border_width,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.ACTIVE_POINT])
+            layers.append((MapRendererLayer.ACTIVE_POINT, self._layers[MapRendererLayer.ACTIVE_POINT]))
 
         if map_data.segments and (self.config.icon or self.config.name or self.config.order or self.config.suction_level or self.config.water_volume or self.config.cleaning_times or self.config.cleaning_mode):
             if (
                 self._map_data is None
-                or self._map_data.segments != map_data.segments
+                or map_data.changed(self._map_data, "segments")
                 or self._map_data.rotation != map_data.rotation
                 or bool(self._map_data.cleanset) != bool(map_data.cleanset)
                 or not self._layers.get(MapRendererLayer.SEGMENTS)
@@ -3945,7 +4370,7 @@ class DreameVacuumMapRenderer:
 
             if self._layers[MapRendererLayer.SEGMENTS]:
                 for k, v in sorted(self._layers[MapRendererLayer.SEGMENTS].items(), reverse=True):
-                    layer = Image.alpha_composite(layer, v)
+                    layers.append((MapRendererLayer.SEGMENTS, v))
 
         if map_data.charger_position and self.config.charger:
             if (
@@ -4091,8 +4516,7 @@ class DreameVacuumMapRenderer:
                     map_data.rotation,
                     scale,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.CHARGER])
+            layers.append((MapRendererLayer.CHARGER, self._layers[MapRendererLayer.CHARGER]))
 
         if map_data.robot_position and self.config.robot:
             if (
@@ -4155,6 +4579,8 @@ class DreameVacuumMapRenderer:
                         charger_angle + 180 if self._robot_shape != 2 else charger_angle
                     )
 
+                robot_layer = self._layers.get(MapRendererLayer.ROBOT)
+                robot_area = self._robot_area
                 self._layers[MapRendererLayer.ROBOT] = self.render_vacuum(
                     robot_position,
                     robot_status,
@@ -4163,9 +4589,18 @@ class DreameVacuumMapRenderer:
                     int(robot_icon_size * map_data.dimensions.scale),
                     map_data.rotation,
                     scale,
+                    robot_area if self._map_data is not None else None,
                 )
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.ROBOT])
+                point = robot_position.to_img(map_data.dimensions)
+                self._robot_area = DreameVacuumMapRenderer._get_icon_area(
+                    self._layers[MapRendererLayer.ROBOT],
+                    point.x * scale,
+                    point.y * scale,
+                    int(robot_icon_size * map_data.dimensions.scale) * scale * 2,
+                )
+                if self._layers[MapRendererLayer.ROBOT] is robot_layer:
+                    updated_areas[MapRendererLayer.ROBOT] = [robot_area, self._robot_area] if self._robot_area else [robot_area]
+            layers.append((MapRendererLayer.ROBOT, self._layers[MapRendererLayer.ROBOT]))
 
         if map_data.obstacles and self.config.obstacle:
             if (
@@ -4183,17 +4618,134 @@ class DreameVacuumMapRenderer:
                     scale,
                 )
 
-            layer = Image.alpha_composite(
-                layer, self._layers[MapRendererLayer.OBSTACLES])
+            layers.append((MapRendererLayer.OBSTACLES, self._layers[MapRendererLayer.OBSTACLES]))
+
+        for k, areas in updated_areas.items():
+            self._update_layer_box(self._layers[k], areas)
+        self._layer_boxes = {id(v): self._layer_boxes[id(v)] for (k, v) in layers[1:] if id(v) in self._layer_boxes}
+
+        areas = self._get_changed_areas(layers, image_area, updated_areas, scale)
+        self._composite_layers = layers
+        if areas is None or self._composite.size != map_image.size or layer.size != (int(map_image.size[0] * scale), int(map_image.size[1] * scale)):
+            # Layers are composited only within the bounding boxes of their visible pixels, fully transparent pixels do not change the result
+            objects = Image.new("RGBA", layer.size, (255, 255, 255, 0))
+            for (k, v) in layers[1:]:
+                box = self._get_layer_box(v)
+                if box:
+                    objects.alpha_composite(v, box[:2], box)
+
+            if objects.size != map_image.size:
+                objects.thumbnail(
+                    map_image.size, self._resample, reducing_gap=None)
+
+            self._composite = Image.alpha_composite(
+                map_image,
+                objects,
+            )
+            return self._composite
 
-        if layer.size != map_image.size:
-            layer.thumbnail(
-                map_image.size, Image.Resampling.BOX, reducing_gap=1.5)
+        # Only the changed areas are composited again from all layers in drawing order and updated on the previous image
+        for area in areas:
+            box = (
+                max(int(math.floor(area[0] / scale)) * scale, 0),
+                max(int(math.floor(area[1] / scale)) * scale, 0),
+                min(int(math.ceil(area[2] / scale)) * scale, layer.size[0]),
+                min(int(math.ceil(area[3] / scale)) * scale, layer.size[1]),
+            )
+            if box[2] <= box[0] or box[3] <= box[1]:
+                continue
+
+            region = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), (255, 255, 255, 0))
+            for (k, v) in layers[1:]:
+                layer_box = self._get_layer_box(v)
+                if (
+                    layer_box
+                    and layer_box[0] < box[2]
+                    and layer_box[1] < box[3]
+                    and layer_box[2] > box[0]
+                    and layer_box[3] > box[1]
+                ):
+                    region = Image.alpha_composite(region, v.crop(box))
+
+            image_box = (box[0] // scale, box[1] // scale, box[2] // scale, box[3] // scale)
+            region = region.resize(
+                (image_box[2] - image_box[0], image_box[3] - image_box[1]), self._resample)
+
+            self._composite.paste(Image.alpha_composite(map_image.crop(image_box), region), image_box)
+        return self._composite
+
+    def _get_changed_areas(self, layers, image_area, updated_areas, scale) -> list[list[int]] | None:
+        """Find the areas of the object layer that are changed since the previous image or None if it needs to be composited again.
+        Map image, path and robot layers are updated in place when only some of their pixels are changed, a layer that is replaced with a new image changes the whole composite."""
+        if self._composite is None or self._composite_layers is None or len(self._composite_layers) != len(layers):
+            return None
 
-        return Image.alpha_composite(
-            map_image,
-            layer,
+        areas = []
+        for (k, v), (previous_k, previous_v) in zip(layers, self._composite_layers):
+            if k != previous_k or v is not previous_v:
+                return None
+            if k in updated_areas:
+                areas.extend(updated_areas[k])
+
+        if image_area:
+            areas.append([v * scale for v in image_area])
+        return areas
+
+    def _get_layer_box(self, layer) -> tuple[int] | None:
+        """Bounding box of the visible pixels of a layer, kept until the layer is replaced with a new image"""
+        cached = self._layer_boxes.get(id(layer))
+        if cached is None or cached[0] is not layer:
+            cached = (layer, layer.getchannel("A").getbbox())
+            self._layer_boxes[id(layer)] = cached
+        return cached[1]
+
+    def _update_layer_box(self, layer, areas) -> None:
+        """Extend the bounding box of a layer with the areas that are drawn in place"""
+        cached = self._layer_boxes.get(id(layer))
+        if cached is None or cached[0] is not layer:
+            return
+        box = cached[1]
+        for area in areas:
+            area = (max(area[0], 0), max(area[1], 0), min(area[2], layer.size[0]), min(area[3], layer.size[1]))
+            if area[2] <= area[0] or area[3] <= area[1]:
+                continue
+            box = area if box is None else (min(box[0], area[0]), min(box[1], area[1]), max(box[2], area[2]), max(box[3], area[3]))
+        self._layer_boxes[id(layer)] = (layer, box)
+
+    @staticmethod
+    def _get_path_area(path, dimensions, width, scale) -> list[int]:
+        x, y = path.to_img(dimensions)
+        # Mop lines are the widest lines on the path layer
+        size = int(math.ceil(width * scale * 12 / 2)) + scale
+        return [
+            int(math.floor(x.min() * scale)) - size,
+            int(math.floor(y.min() * scale)) - size,
+            int(math.ceil(x.max() * scale)) + size,
+            int(math.ceil(y.max() * scale)) + size,
+        ]
+
+    @staticmethod
+    def _get_icon_area(layer, x, y, size) -> list[int] | None:
+        """Bounding box of the icons drawn around a point, whole layer is checked when the icons are not in the expected size"""
+        box = (
+            max(int(x - size), 0),
+            max(int(y - size), 0),
+            min(int(x + size), layer.size[0]),
+            min(int(y + size), layer.size[1]),
         )
+        if box[2] > box[0] and box[3] > box[1]:
+            area = layer.crop(box).getbbox()
+            if area is None:
+                return None
+            if (
+                (area[0] > 0 or box[0] == 0)
+                and (area[1] > 0 or box[1] == 0)
+                and (area[2] < box[2] - box[0] or box[2] == layer.size[0])
+                and (area[3] < box[3] - box[1] or box[3] == layer.size[1])
+            ):
+                return [area[0] + box[0], area[1] + box[1], area[2] + box[0], area[3] + box[1]]
+        area = layer.getbbox()
+        return list(area) if area else None
 
     def render_areas(self, areas, color, fill, layer, dimensions, width, scale):
         new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
@@ -4247,51 +4799,51 @@ class DreameVacuumMapRenderer:
             )
         return new_layer
 
-    def render_path(self, path, color, layer, dimensions, width, scale):
-        new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
-        draw = ImageDraw.Draw(new_layer, "RGBA")
+    def render_path(self, path, color, layer, dimensions, width, scale, start=0, area=None):
+        # Mop and sweep lines are kept on separate layers so new points can be drawn on top of the previous ones without changing the order of the lines
+        if (
+            start == 0
+            or not self._layers.get(MapRendererLayer.PATH_MOP)
+            or not self._layers.get(MapRendererLayer.PATH_SWEEP)
+        ):
+            start = 0
+            self._layers[MapRendererLayer.PATH_MOP] = Image.new("RGBA", layer.size, (255, 255, 255, 0))
+            self._layers[MapRendererLayer.PATH_SWEEP] = Image.new("RGBA", layer.size, (255, 255, 255, 0))
+        # Previous path layer is updated in place when only the area of the new points is changed
+        path_layer = self._layers.get(MapRendererLayer.PATH) if start > 0 and area else None
+        mop_draw = ImageDraw.Draw(self._layers[MapRendererLayer.PATH_MOP], "RGBA")
+        draw = ImageDraw.Draw(self._layers[MapRendererLayer.PATH_SWEEP], "RGBA")
         sweep = []
         mop = []
-        sweep_path = []
-        mop_path = []
-        path_type = ""
-
-        for point in path:
-            p = point.to_img(dimensions)
-            if point.path_type == PathType.LINE:
-                l = [p.x * scale, p.y * scale]
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.SWEEP:
-                    sweep_path.extend(l)
-
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP:
-                    mop_path.extend(l)
-            else:
-                if mop_path:
-                    mop.append(mop_path)
-
-                if sweep_path:
-                    sweep.append(sweep_path)
-
-                path_type = point.path_type
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.SWEEP:
-                    sweep_path = [p.x * scale, p.y * scale]
-                else:
-                    sweep_path = []
-
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP:
-                    mop_path = [p.x * scale, p.y * scale]
-                else:
-                    mop_path = []
-
-        if sweep_path:
-            sweep.append(sweep_path)
 
-        if mop_path:
-            mop.append(mop_path)
+        if start > 0:
+            # Continue the line of the last drawn point with the type of the point it was started from
+            anchors = np.flatnonzero(~path[:start].is_type(PathType.LINE))
+            path_type = path.path_type[anchors[-1]] if len(anchors) else None
+            path = path[start - 1:]
+            if path_type is not None:
+                path.path_type = path.path_type.copy()
+                path.path_type[0] = path_type
+
+        # Points that would be drawn on the same pixel are not visible at the render scale
+        path = path.simplify(self.profile.path_tolerance * dimensions.grid_size / (dimensions.scale * scale))
+        x, y = path.to_img(dimensions)
+        points = np.stack((x * scale, y * scale), axis=1)
+
+        # Every point that is not a line starts a new line on the sweep and/or mop layers, lines before the first one are not drawn
+        starts = np.flatnonzero(~path.is_type(PathType.LINE))
+        sweep_starts = path[starts].is_type(PathType.SWEEP_AND_MOP, PathType.SWEEP)
+        mop_starts = path[starts].is_type(PathType.SWEEP_AND_MOP, PathType.MOP)
+        for i, (start, end) in enumerate(zip(starts, np.append(starts[1:], len(path)))):
+            line = points[start:end].ravel().tolist()
+            if mop_starts[i]:
+                mop.append(line)
+            if sweep_starts[i]:
+                sweep.append(line)
 
         for path in mop:
             size = width * scale * 12
-            draw.line(
+            mop_draw.line(
                 path,
                 width=int(size),
                 fill=(color[0], color[1], color[2], 100),
@@ -4324,7 +4876,18 @@ class DreameVacuumMapRenderer:
                 fill=color,
             )
 
-        return new_layer
+        if path_layer:
+            box = (max(area[0], 0), max(area[1], 0), min(area[2], layer.size[0]), min(area[3], layer.size[1]))
+            if box[2] > box[0] and box[3] > box[1]:
+                path_layer.paste(
+                    Image.alpha_composite(
+                        self._layers[MapRendererLayer.PATH_MOP].crop(box), self._layers[MapRendererLayer.PATH_SWEEP].crop(box)
+                    ),
+                    box,
+                )
+            return path_layer
+
+        return Image.alpha_composite(self._layers[MapRendererLayer.PATH_MOP], self._layers[MapRendererLayer.PATH_SWEEP])
 
     def render_charger(
         self, charger_position, robot_status, layer, dimensions, size, map_rotation, scale
@@ -4348,7 +4911,7 @@ class DreameVacuumMapRenderer:
             self._charger_icon = (
                 Image.open(BytesIO(base64.b64decode(charger_image)))
                 .convert("RGBA")
-                .resize((icon_size, icon_size), resample=Image.Resampling.NEAREST)
+                .resize((icon_size, icon_size), resample=self._icon_resample)
             )
 
             if self.icon_set == 3:
@@ -4378,7 +4941,7 @@ class DreameVacuumMapRenderer:
                     Image.open(
                         BytesIO(base64.b64decode(MAP_ROBOT_WASHING_IMAGE)))
                     .convert("RGBA")
-                    .resize((int(icon_size * 1.25), int(icon_size * 1.25)), resample=Image.Resampling.NEAREST)
+                    .resize((int(icon_size * 1.25), int(icon_size * 1.25)), resample=self._icon_resample)
                     .rotate(-map_rotation)
                 )
                 enhancer = ImageEnhance.Brightness(self._robot_washing_icon)
@@ -4408,9 +4971,14 @@ class DreameVacuumMapRenderer:
         return new_layer
 
     def render_vacuum(
-        self, robot_position, robot_status, layer, dimensions, size, map_rotation, scale
+        self, robot_position, robot_status, layer, dimensions, size, map_rotation, scale, area=None
     ):
-        new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
+        new_layer = self._layers.get(MapRendererLayer.ROBOT)
+        if area and new_layer and new_layer.size == layer.size:
+            # Previously drawn icons are cleared instead of allocating a new layer for every robot position
+            new_layer.paste((255, 255, 255, 0), tuple(area))
+        else:
+            new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
         icon_size = int(size * scale)
         if self._robot_icon is None:
             robot_icon_size = icon_size
@@ -4439,7 +5007,7 @@ class DreameVacuumMapRenderer:
             self._robot_icon = (
                 Image.open(BytesIO(base64.b64decode(robot_image)))
                 .convert("RGBA")
-                .resize((robot_icon_size, robot_icon_size), resample=Image.Resampling.NEAREST)
+                .resize((robot_icon_size, robot_icon_size), resample=self._icon_resample)
             )
 
             if self._robot_shape != 2 and self.icon_set != 2 and self.icon_set != 3:
@@ -4459,7 +5027,7 @@ class DreameVacuumMapRenderer:
                     Image.open(
                         BytesIO(base64.b64decode(MAP_ROBOT_CLEANING_IMAGE)))
                     .convert("RGBA")
-                    .resize(((int(icon_size * 1.25), int(icon_size * 1.25))), resample=Image.Resampling.NEAREST)
+                    .resize(((int(icon_size * 1.25), int(icon_size * 1.25))), resample=self._icon_resample)
                 )
             status_icon = self._robot_cleaning_icon
 
@@ -4469,7 +5037,7 @@ class DreameVacuumMapRenderer:
                         Image.open(
                             BytesIO(base64.b64decode(MAP_ROBOT_CLEANING_DIRECTION_IMAGE)))
                         .convert("RGBA")
-                        .resize(((int(icon_size * 1.5), int(icon_size * 1.5))), resample=Image.Resampling.NEAREST)
+                        .resize(((int(icon_size * 1.5), int(icon_size * 1.5))), resample=self._icon_resample)
                     )
                 
                 ico = self._robot_cleaning_direction_icon.rotate(robot_position.a, expand=1)
@@ -4489,7 +5057,7 @@ class DreameVacuumMapRenderer:
                     Image.open(
                         BytesIO(base64.b64decode(MAP_ROBOT_CHARGING_IMAGE)))
                     .convert("RGBA")
-                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST)
+                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=self._icon_resample)
                 )
             status_icon = self._robot_charging_icon
         elif robot_status == 3 or robot_status == 5 or robot_status == 6:
@@ -4498,7 +5066,7 @@ class DreameVacuumMapRenderer:
                     Image.open(
                         BytesIO(base64.b64decode(MAP_ROBOT_WARNING_IMAGE)))
                     .convert("RGBA")
-                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST)
+                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=self._icon_resample)
                 )
             status_icon = self._robot_warning_icon
 
@@ -4537,9 +5105,9 @@ class DreameVacuumMapRenderer:
                     sleeping_icon = enhancer.enhance(0.7)
 
                 self._robot_sleeping_icon = [
-                    sleeping_icon.resize(((int(icon_size * 0.3), int(icon_size * 0.3))), resample=Image.Resampling.NEAREST),
+                    sleeping_icon.resize(((int(icon_size * 0.3), int(icon_size * 0.3))), resample=self._icon_resample),
                     sleeping_icon.resize(
-                        ((int(icon_size * 0.35), int(icon_size * 0.35))), resample=Image.Resampling.NEAREST),
+                        ((int(icon_size * 0.35), int(icon_size * 0.35))), resample=self._icon_resample),
                 ]
                 
             for k in [[int(icon_size * 0.34), int(icon_size * 0.18), 0], [int(icon_size * 0.43), int(icon_size * 0.43), 1]]:
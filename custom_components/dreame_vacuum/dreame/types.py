@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import itertools
+import json
 import math
+import re
+import numpy as np
 from typing import Any, Dict, Final, List, Optional
 from enum import IntEnum, Enum
 from dataclasses import dataclass, field
@@ -787,6 +793,8 @@ class ObstacleType(IntEnum):
     STAIN = 139
 
 class Point:
+    __slots__ = ("x", "y", "a")
+
     def __init__(self, x: float, y: float, a=None) -> None:
         self.x = x
         self.y = y
@@ -801,13 +809,19 @@ class Point:
         return self.__str__()
 
     def __eq__(self: Point, other: Point) -> bool:
-        return (
+        return self is other or (
             other is not None
             and self.x == other.x
             and self.y == other.y
             and self.a == other.a
         )
 
+    def __copy__(self) -> Point:
+        return Point(self.x, self.y, self.a)
+
+    def __deepcopy__(self, memo) -> Point:
+        return self.__copy__()
+
     def as_dict(self) -> Dict[str, Any]:
         if self.a is None:
             return {ATTR_X: self.x, ATTR_Y: self.y}
@@ -854,10 +868,15 @@ class Point:
 
 
 class Path(Point):
+    __slots__ = ("path_type",)
+
     def __init__(self, x: float, y: float, path_type: PathType) -> None:
         super().__init__(x, y)
         self.path_type = path_type
 
+    def __copy__(self) -> Path:
+        return Path(self.x, self.y, self.path_type)
+
     def as_dict(self) -> Dict[str, Any]:
         attributes = {**super().as_dict()}
         if self.path_type:
@@ -865,7 +884,213 @@ class Path(Point):
         return attributes
 
 
+class PathList:
+    """Cleaning path points stored in arrays, items are returned as Path objects for list like access"""
+
+    TOKEN_PATTERN: Final = re.compile(r"(?P<operator>[MWSLl])(?P<x>-?\d+),(?P<y>-?\d+)")
+
+    # Character class lookup tables for the path tokenizer
+    _OPERATORS = np.isin(np.arange(256), np.frombuffer(b"MWSLl", np.uint8))
+    _DIGITS = np.isin(np.arange(256), np.frombuffer(b"0123456789", np.uint8))
+    _POWERS = 10 ** np.arange(19, dtype=np.int64)
+
+    def __init__(self, x: np.ndarray = None, y: np.ndarray = None, path_type: np.ndarray = None) -> None:
+        self.x = np.zeros(0, np.int64) if x is None else x
+        self.y = np.zeros(0, np.int64) if y is None else y
+        # Character code of the PathType value
+        self.path_type = np.zeros(0, np.uint8) if path_type is None else path_type
+
+    @staticmethod
+    def _tokenize(value: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Parse operators and numbers of a path string in the form of M100,200L-5,3 without a regular expression, returns None when the string is not in the expected format"""
+        try:
+            data = np.frombuffer(value.encode("ascii"), np.uint8)
+        except UnicodeEncodeError:
+            return None
+
+        operators = PathList._OPERATORS[data]
+        commas = data == ord(",")
+        separators = operators | commas
+        positions = np.flatnonzero(separators)
+        count = len(positions)
+        if (
+            count == 0
+            or count % 2
+            or not operators[0]
+            or not operators[positions[0::2]].all()
+            or not commas[positions[1::2]].all()
+        ):
+            return None
+
+        starts = positions + 1
+        ends = np.append(positions[1:], len(data))
+        if not (starts < ends).all():
+            return None
+
+        negative = data[starts] == ord("-")
+        digit_starts = starts + negative
+        if not (digit_starts < ends).all() or (ends - digit_starts).max() >= len(PathList._POWERS):
+            return None
+
+        digits = PathList._DIGITS[data]
+        invalid = ~separators & ~digits
+        invalid[starts[negative]] = False
+        if invalid.any():
+            return None
+
+        index = np.cumsum(separators) - 1
+        weights = np.where(
+            digits,
+            (data.astype(np.int64) - ord("0")) * PathList._POWERS[np.clip(ends[index] - 1 - np.arange(len(data)), 0, None)],
+            0
+        )
+        values = np.add.reduceat(weights, starts)
+        values[negative] = -values[negative]
+        return data[positions[0::2]], values
+
+    @staticmethod
+    def from_string(value: str) -> PathList:
+        tokens = PathList._tokenize(value)
+        if tokens is not None:
+            operators, values = tokens
+        else:
+            # Fall back to the regular expression on unexpected content
+            matches = PathList.TOKEN_PATTERN.findall(value)
+            operators = np.frombuffer("".join(m[0] for m in matches).encode("ascii"), dtype=np.uint8)
+            values = np.array([v for m in matches for v in m[1:]], dtype=np.int64)
+
+        if not len(operators):
+            return PathList()
+
+        values = values.reshape(-1, 2)
+
+        # "L" points are relative to the previous point and others are absolute
+        relative = operators == ord(PathType.LINE.value)
+        total = np.cumsum(values, axis=0)
+        offset = np.zeros((np.count_nonzero(~relative) + 1, 2), np.int64)
+        offset[1:] = (total - values)[~relative]
+        values = total - offset[np.cumsum(~relative)]
+
+        # You will only get "l" paths with in a P frame.
+        # It means path is connected with the path from previous frame and it should be rendered as a line.
+        path_type = operators.copy()
+        path_type[operators == ord("l")] = ord(PathType.LINE.value)
+        return PathList(values[:, 0].copy(), values[:, 1].copy(), path_type)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __bool__(self) -> bool:
+        return len(self.x) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, (slice, np.ndarray)):
+            return PathList(self.x[index], self.y[index], self.path_type[index])
+        return Path(int(self.x[index]), int(self.y[index]), PathType(chr(self.path_type[index])))
+
+    def __iter__(self):
+        for x, y, path_type in zip(self.x.tolist(), self.y.tolist(), self.path_type.tolist()):
+            yield Path(x, y, PathType(chr(path_type)))
+
+    def __eq__(self: PathList, other: PathList) -> bool:
+        return (
+            isinstance(other, PathList)
+            and len(self.x) == len(other.x)
+            and np.array_equal(self.x, other.x)
+            and np.array_equal(self.y, other.y)
+            and np.array_equal(self.path_type, other.path_type)
+        )
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def starts_with(self, other: PathList) -> bool:
+        count = len(other.x)
+        return (
+            len(self.x) >= count
+            and np.array_equal(self.x[:count], other.x)
+            and np.array_equal(self.y[:count], other.y)
+            and np.array_equal(self.path_type[:count], other.path_type)
+        )
+
+    def extend(self, other: PathList) -> None:
+        self.x = np.concatenate((self.x, other.x))
+        self.y = np.concatenate((self.y, other.y))
+        self.path_type = np.concatenate((self.path_type, other.path_type))
+
+    def is_type(self, *path_types: PathType) -> np.ndarray:
+        return np.isin(self.path_type, [ord(path_type.value) for path_type in path_types])
+
+    def simplify(self, tolerance: float) -> PathList:
+        """Douglas-Peucker simplification of the lines, farthest points of all lines are added at once until every dropped point is closer than tolerance"""
+        count = len(self.x)
+        if not tolerance or tolerance <= 0 or count < 3:
+            return self
+
+        # First and last points of the lines are always kept
+        keep = self.path_type != ord(PathType.LINE.value)
+        keep[:-1] |= keep[1:]
+        keep[0] = keep[-1] = True
+
+        x = self.x.astype(np.float64)
+        y = self.y.astype(np.float64)
+        candidates = np.flatnonzero(~keep)
+        while len(candidates):
+            kept = np.flatnonzero(keep)
+            position = np.searchsorted(kept, candidates)
+            start = kept[position - 1]
+            end = kept[position]
+            dx = x[end] - x[start]
+            dy = y[end] - y[start]
+            px = x[candidates] - x[start]
+            py = y[candidates] - y[start]
+            length = np.hypot(dx, dy)
+            distance = np.where(
+                length > 0, np.abs(px * dy - py * dx) / np.where(length > 0, length, 1), np.hypot(px, py)
+            )
+
+            # Keep the farthest point between every two kept points, points of the lines that are already close enough are dropped
+            groups = np.flatnonzero(np.r_[True, start[1:] != start[:-1]])
+            counts = np.diff(np.r_[groups, len(start)])
+            maximum = np.maximum.reduceat(distance, groups)
+            split = np.repeat(maximum > tolerance, counts)
+            if not split.any():
+                break
+            farthest = np.flatnonzero(split & (distance == np.repeat(maximum, counts)))
+            farthest = farthest[np.r_[True, start[farthest][1:] != start[farthest][:-1]]]
+            keep[candidates[farthest]] = True
+            split[farthest] = False
+            candidates = candidates[split]
+
+        if keep.all():
+            return self
+        return self[keep]
+
+    def as_dict(self) -> List[Dict[str, Any]]:
+        return [point.as_dict() for point in self]
+
+    def to_img(self, image_dimensions) -> tuple[np.ndarray, np.ndarray]:
+        return (
+            ((self.x - image_dimensions.left) / image_dimensions.grid_size) * image_dimensions.scale
+            + image_dimensions.padding[0] - image_dimensions.crop[0],
+            (
+                (
+                    (image_dimensions.height - 1) * image_dimensions.grid_size
+                    - (self.y - image_dimensions.top)
+                )
+                / image_dimensions.grid_size
+            )
+            * image_dimensions.scale
+            + image_dimensions.padding[1] - image_dimensions.crop[1],
+        )
+
+
 class Obstacle(Point):
+    __slots__ = ("obstacle_type", "possibility", "key", "file_name", "random")
+
     def __init__(self, x: float, y: float, obstacle_type: ObstacleType, possibility: int, key: int = None, file_name: str = None, random: int = None) -> None:
         super().__init__(x, y)
         self.obstacle_type = obstacle_type
@@ -874,6 +1099,9 @@ class Obstacle(Point):
         self.file_name = file_name
         self.random = random
 
+    def __copy__(self) -> Obstacle:
+        return Obstacle(self.x, self.y, self.obstacle_type, self.possibility, self.key, self.file_name, self.random)
+
     def as_dict(self) -> Dict[str, Any]:
         attributes = super().as_dict()
         attributes[ATTR_TYPE] = self.obstacle_type.name.replace("_", " ").capitalize()
@@ -882,6 +1110,8 @@ class Obstacle(Point):
 
 
 class Zone:
+    __slots__ = ("x0", "y0", "x1", "y1")
+
     def __init__(self, x0: float, y0: float, x1: float, y1: float) -> None:
         self.x0 = x0
         self.y0 = y0
@@ -892,7 +1122,7 @@ class Zone:
         return f"[{self.x0}, {self.y0}, {self.x1}, {self.y1}]"
 
     def __eq__(self: Zone, other: Zone) -> bool:
-        return (
+        return self is other or (
             other is not None
             and self.x0 == other.x0
             and self.y0 == other.y0
@@ -900,6 +1130,12 @@ class Zone:
             and self.y1 == other.y1
         )
 
+    def __copy__(self) -> Zone:
+        return Zone(self.x0, self.y0, self.x1, self.y1)
+
+    def __deepcopy__(self, memo) -> Zone:
+        return self.__copy__()
+
     def __repr__(self) -> str:
         return self.__str__()
 
@@ -922,6 +1158,25 @@ class Zone:
         return Zone(p0.x, p0.y, p1.x, p1.y)
 
 class Segment(Zone):
+    __slots__ = (
+        "segment_id",
+        "unique_id",
+        "x",
+        "y",
+        "name",
+        "custom_name",
+        "type",
+        "index",
+        "icon",
+        "neighbors",
+        "order",
+        "cleaning_times",
+        "suction_level",
+        "water_volume",
+        "cleaning_mode",
+        "color_index",
+    )
+
     def __init__(
         self,
         segment_id: int,
@@ -1055,6 +1310,8 @@ class Segment(Zone):
         return attributes
 
     def __eq__(self: Segment, other: Segment) -> bool:
+        if self is other:
+            return True
         return not (
             other is None
             or self.x0 != other.x0
@@ -1076,6 +1333,18 @@ class Segment(Zone):
             or self.cleaning_mode != other.cleaning_mode
         )
 
+    def __copy__(self) -> Segment:
+        segment = Segment.__new__(Segment)
+        for attr in Zone.__slots__ + Segment.__slots__:
+            setattr(segment, attr, getattr(self, attr))
+        return segment
+
+    def __deepcopy__(self, memo) -> Segment:
+        # Neighbors is the only mutable attribute
+        segment = self.__copy__()
+        segment.neighbors = list(self.neighbors) if self.neighbors is not None else None
+        return segment
+
     def __str__(self) -> str:
         return f"{{room_id: {self.segment_id}, outline: {self.outline}}}"
 
@@ -1084,6 +1353,8 @@ class Segment(Zone):
 
 
 class Wall:
+    __slots__ = ("x0", "y0", "x1", "y1")
+
     def __init__(self, x0: float, y0: float, x1: float, y1: float) -> None:
         self.x0 = x0
         self.y0 = y0
@@ -1091,7 +1362,7 @@ class Wall:
         self.y1 = y1
 
     def __eq__(self: Wall, other: Wall) -> bool:
-        return (
+        return self is other or (
             other is not None
             and self.x0 == other.x0
             and self.y0 == other.y0
@@ -1099,6 +1370,12 @@ class Wall:
             and self.y1 == other.y1
         )
 
+    def __copy__(self) -> Wall:
+        return Wall(self.x0, self.y0, self.x1, self.y1)
+
+    def __deepcopy__(self, memo) -> Wall:
+        return self.__copy__()
+
     def __str__(self) -> str:
         return f"[{self.x0}, {self.y0}, {self.x1}, {self.y1}]"
 
@@ -1123,6 +1400,8 @@ class Wall:
 
 
 class Area:
+    __slots__ = ("x0", "y0", "x1", "y1", "x2", "y2", "x3", "y3")
+
     def __init__(
         self,
         x0: float,
@@ -1144,7 +1423,7 @@ class Area:
         self.y3 = y3
 
     def __eq__(self: Area, other: Area) -> bool:
-        return (
+        return self is other or (
             other is not None
             and self.x0 == other.x0
             and self.y0 == other.y0
@@ -1156,6 +1435,12 @@ class Area:
             and self.y3 == other.y3
         )
 
+    def __copy__(self) -> Area:
+        return Area(self.x0, self.y0, self.x1, self.y1, self.x2, self.y2, self.x3, self.y3)
+
+    def __deepcopy__(self, memo) -> Area:
+        return self.__copy__()
+
     def __str__(self) -> str:
         return f"[{self.x0}, {self.y0}, {self.x1}, {self.y1}, {self.x2}, {self.y2}, {self.x3}, {self.y3}]"
 
@@ -1269,6 +1554,29 @@ class MapDataPartial:
 
 
 class MapData:
+    # Field groups that are tracked with versions, a group gets a new unique version whenever any of its fields is changed
+    # so two map data with the same group version are known to have the same values without comparing them
+    VERSION_GROUPS: Final = {
+        "geometry_version": ("dimensions", "optimized_dimensions", "rotation"),
+        "pixels_version": ("data", "pixel_type", "optimized_pixel_type"),
+        "segments_version": ("segments", "cleanset"),
+        "restrictions_version": ("no_go_areas", "no_mopping_areas", "walls"),
+        "path_version": ("path",),
+    }
+    VERSION_FIELDS: Final = {field: version for version, fields in VERSION_GROUPS.items() for field in fields}
+    # Fields that are not part of the content hash, raw data is left out because pixel type is generated from it
+    CONTENT_HASH_EXCLUDED: Final = (
+        "data",
+        "frame_id",
+        "frame_type",
+        "timestamp_ms",
+        "last_updated",
+        "need_optimization",
+        "changed_pixels",
+        "changed_pixels_version",
+    )
+    _versions = itertools.count(1)
+
     def __init__(self) -> None:
         # Header
         self.map_id: Optional[int] = None  # Map header: map_id
@@ -1290,7 +1598,7 @@ class MapData:
         self.no_go_areas: Optional[List[Area]] = None  # Data json: vw.rect
         self.no_mopping_areas: Optional[List[Area]] = None  # Data json: vw.mop
         self.walls: Optional[List[Wall]] = None  # Data json: vw.line
-        self.path: Optional[Path] = None  # Data json: tr
+        self.path: Optional[PathList] = None  # Data json: tr
         self.active_segments: Optional[int] = None  # Data json: sa
         self.active_areas: Optional[List[Area]] = None  # Data json: da2
         self.active_points: Optional[List[Point]] = None  # Data json: sp
@@ -1328,6 +1636,79 @@ class MapData:
         self.last_updated: Optional[float] = None
         # For vslam map rendering optimization
         self.need_optimization: Optional[bool] = None
+        # Generated from P frames, changed pixel area [left, top, right, bottom] since each of the previous pixels versions
+        self.changed_pixels: Optional[Dict[int, List[int]]] = None
+        # Pixels version that the changed pixel areas are leading to
+        self.changed_pixels_version: Optional[int] = None
+        # For detecting changes without comparing the fields
+        self.geometry_version: int = MapData.new_version()
+        self.pixels_version: int = MapData.new_version()
+        self.segments_version: int = MapData.new_version()
+        self.restrictions_version: int = MapData.new_version()
+        self.path_version: int = MapData.new_version()
+
+    @staticmethod
+    def new_version() -> int:
+        return next(MapData._versions)
+
+    @staticmethod
+    def _equal(value, other_value) -> bool:
+        if value is other_value:
+            return True
+        if isinstance(value, np.ndarray) or isinstance(other_value, np.ndarray):
+            if value is None or other_value is None:
+                return False
+            if isinstance(value, (bytes, bytearray)):
+                value = np.frombuffer(value, dtype=np.uint8)
+            if isinstance(other_value, (bytes, bytearray)):
+                other_value = np.frombuffer(other_value, dtype=np.uint8)
+            return value.shape == other_value.shape and np.array_equal(value, other_value)
+        return value == other_value
+
+    def changed(self, other: MapData, *fields: str) -> bool:
+        """Check if any of the fields is changed from the other map data, only the fields that are set to None after taking a snapshot are compared when their versions are equal"""
+        if other is None:
+            return True
+
+        for field in fields:
+            value = getattr(self, field)
+            other_value = getattr(other, field)
+            if value is None or other_value is None:
+                if value is not other_value:
+                    return True
+                continue
+
+            version = MapData.VERSION_FIELDS.get(field)
+            if version is not None and getattr(self, version) == getattr(other, version):
+                continue
+
+            if not MapData._equal(value, other_value):
+                return True
+        return False
+
+    def set_changed(self, *fields: str) -> None:
+        """Get new versions for the groups of the changed fields"""
+        for version in {MapData.VERSION_FIELDS[field] for field in fields}:
+            setattr(self, version, MapData.new_version())
+
+    def changed_area(self, other: MapData) -> List[int] | None:
+        """Pixel area [left, top, right, bottom] that contains all changed pixels since the other map data or None if it is not known"""
+        if (
+            other is None
+            or self.changed_pixels is None
+            or self.changed_pixels_version != self.pixels_version
+            or self.dimensions != other.dimensions
+        ):
+            return None
+        return self.changed_pixels.get(other.pixels_version)
+
+    def update_versions(self, previous: MapData = None) -> None:
+        """Keep the versions of the groups that are not changed from the previous map data and get new versions for the others, all groups get new versions without previous map data"""
+        for version, fields in MapData.VERSION_GROUPS.items():
+            if previous is not None and all(MapData._equal(getattr(self, field), getattr(previous, field)) for field in fields):
+                setattr(self, version, getattr(previous, version))
+            else:
+                setattr(self, version, MapData.new_version())
 
     def __eq__(self: MapData, other: MapData) -> bool:
         if other is None:
@@ -1351,13 +1732,7 @@ class MapData:
         if self.charger_position != other.charger_position:
             return False
 
-        if self.no_go_areas != other.no_go_areas:
-            return False
-
-        if self.no_mopping_areas != other.no_mopping_areas:
-            return False
-
-        if self.walls != other.walls:
+        if self.changed(other, "no_go_areas", "no_mopping_areas", "walls"):
             return False
 
         if self.docked != other.docked:
@@ -1393,11 +1768,53 @@ class MapData:
         if self.new_map != other.new_map:
             return False
 
-        if self.cleanset != other.cleanset:
+        if self.changed(other, "cleanset"):
             return False
 
         return True
 
+    def snapshot(self) -> MapData:
+        """Lightweight copy of the map data for rendering.
+        Pixel buffers and the path are shared with the original because map manager replaces them with new objects instead of modifying on every frame,
+        attributes that are edited in place by the map editor, device or renderer are copied."""
+        map_data = copy.copy(self)
+        map_data.dimensions = copy.copy(self.dimensions)
+        map_data.optimized_dimensions = copy.copy(self.optimized_dimensions)
+        map_data.robot_position = copy.copy(self.robot_position)
+        map_data.charger_position = copy.copy(self.charger_position)
+        map_data.optimized_charger_position = copy.copy(self.optimized_charger_position)
+        map_data.no_go_areas = copy.copy(self.no_go_areas)
+        map_data.no_mopping_areas = copy.copy(self.no_mopping_areas)
+        map_data.walls = copy.copy(self.walls)
+        map_data.active_segments = copy.copy(self.active_segments)
+        map_data.active_areas = copy.copy(self.active_areas)
+        map_data.active_points = copy.copy(self.active_points)
+        map_data.obstacles = copy.copy(self.obstacles)
+        map_data.cleanset = copy.deepcopy(self.cleanset)
+        if self.segments is not None:
+            map_data.segments = {k: copy.deepcopy(v) for k, v in self.segments.items()}
+        return map_data
+
+    def content_hash(self) -> str:
+        """Hash of the map content for identifying the same map between restarts, versions can not be used for that because they are only unique within the process.
+        Fields that change on every update without changing the content are left out."""
+
+        def content(value):
+            if isinstance(value, np.ndarray):
+                return [value.shape, value.dtype.str, hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()]
+            if isinstance(value, np.generic):
+                return value.item()
+            if hasattr(value, "__dict__"):
+                return vars(value)
+            return [getattr(value, attr, None) for cls in type(value).__mro__ for attr in getattr(cls, "__slots__", ())]
+
+        fields = {
+            k: v
+            for k, v in vars(self).items()
+            if k not in MapData.VERSION_GROUPS and k not in MapData.CONTENT_HASH_EXCLUDED
+        }
+        return hashlib.sha256(json.dumps(fields, default=content, sort_keys=True).encode("utf8")).hexdigest()
+
     def as_dict(self) -> Dict[str, Any]:
         attributes_list = {}
         if self.charger_position is not None:            
@@ -1594,6 +2011,36 @@ MAP_ICON_SET_LIST: Final = {
     "Material": 3
 }
 
+
+@dataclass
+class MapRendererProfile:
+    scale: int = 3  # Map image pixels per map pixel of the current map
+    saved_map_scale: int = 4  # Map image pixels per map pixel of the saved maps
+    supersampling: int = 2  # Object layers are drawn this many times larger than the map image and downsampled
+    resample: str = "BOX"  # Filter for downsampling the object layers, must not sample outside of the supersampled pixel block
+    icon_resample: str = "NEAREST"  # Filter for resizing the robot, charger and status icons
+    path_tolerance: float = 1  # Path points closer than this many pixels on the object layers are decimated, 0 draws the raw path
+    data_path_tolerance: float = 0.5  # Path points of the map data json closer than this ratio of the grid size are decimated, 0 uses the raw path
+
+
+MAP_RENDER_PROFILE_LIST: Final = {
+    "Balanced": MapRendererProfile(),
+    "Fast": MapRendererProfile(
+        scale = 2,
+        saved_map_scale = 3,
+        supersampling = 1,
+        resample = "NEAREST",
+    ),
+    "High Quality": MapRendererProfile(
+        scale = 4,
+        saved_map_scale = 5,
+        supersampling = 3,
+        icon_resample = "LANCZOS",
+        path_tolerance = 0,
+        data_path_tolerance = 0,
+    ),
+}
+
 class MapRendererLayer(IntEnum):
     IMAGE = 0
     OBJECTS = 1
@@ -1607,6 +2054,9 @@ class MapRendererLayer(IntEnum):
     CHARGER = 9
     ROBOT = 10
     OBSTACLES = 11
+    PATH_MOP = 12
+    PATH_SWEEP = 13
+    PIXELS = 14
 
 
 @dataclass
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Map modules are imported as the dreame package of the integration, Home Assistant is not required for them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components", "dreame_vacuum"))
@@ -0,0 +1,39 @@
+"""Helpers for building raw map frames in the format sent by the device."""
+
+import base64
+import json
+import struct
+import zlib
+
+import numpy as np
+
+
+def make_frame(
+    map_id: int = 1,
+    frame_id: int = 1,
+    frame_type: int = 73,
+    width: int = 60,
+    height: int = 50,
+    left: int = -3000,
+    top: int = -2500,
+    grid_size: int = 50,
+    pixels: bytes = None,
+    data_json: dict = None,
+) -> str:
+    header = struct.pack("<hhb", map_id, frame_id, frame_type)
+    header += struct.pack("<hhh", 100, 200, 45) + struct.pack("<hhh", 0, 0, 90)
+    header += struct.pack("<hhhhh", grid_size, width, height, left, top)
+    if pixels is None:
+        pixels = bytes(width * height)
+    raw = header + bytes(pixels) + json.dumps(data_json or {}).encode()
+    return base64.urlsafe_b64encode(zlib.compress(raw)).decode()
+
+
+def room_pixels(width: int, height: int, rooms: int = 2) -> bytes:
+    """Rooms side by side with their wall pixels on the top row"""
+    pixels = np.zeros((height, width), np.uint8)
+    room_width = width // rooms
+    for room in range(rooms):
+        pixels[1:, room * room_width:(room + 1) * room_width] = room + 1
+        pixels[0, room * room_width:(room + 1) * room_width] = 0x80 | (room + 1)
+    return pixels.tobytes()
@@ -0,0 +1,25 @@
+from dreame.map import DreameVacuumMapDecoder
+
+from map_frames import make_frame, room_pixels
+
+
+def test_saved_map_copies_do_not_share_edited_fields():
+    raw_map = make_frame(
+        pixels=room_pixels(60, 50),
+        data_json={
+            "cleanset": {"1": [1, 2, 1, 0], "2": [2, 3, 1, 0]},
+            "seg_inf": {"1": {"nei_id": [2]}, "2": {"nei_id": [1]}},
+        },
+    )
+
+    saved_map_data = DreameVacuumMapDecoder.decode_saved_map(raw_map, False)
+    saved_map_data.cleanset["1"][0] = 99
+    saved_map_data.segments[1].neighbors.remove(2)
+    saved_map_data.segments[2].custom_name = "Kitchen"
+
+    copy = DreameVacuumMapDecoder.decode_saved_map(raw_map, False)
+    assert copy.cleanset == {"1": [1, 2, 1, 0], "2": [2, 3, 1, 0]}
+    assert copy.segments[1].neighbors == [2]
+    assert copy.segments[2].custom_name is None
+    # Read only pixel buffers are shared between the copies
+    assert copy.pixel_type is saved_map_data.pixel_type
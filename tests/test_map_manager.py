@@ -0,0 +1,25 @@
+from dreame.map import DreameMapVacuumMapManager, DreameVacuumMapDecoder
+
+from map_frames import make_frame, room_pixels
+
+
+def test_cached_frame_is_not_changed_by_map_edits():
+    manager = DreameMapVacuumMapManager(None)
+    raw_map = make_frame(
+        pixels=room_pixels(60, 50),
+        data_json={
+            "cleanset": {"1": [1, 2, 1, 0], "2": [2, 3, 1, 0]},
+            "seg_inf": {"1": {"nei_id": [2]}, "2": {"nei_id": [1]}},
+        },
+    )
+
+    map_data = DreameVacuumMapDecoder.decode_map_data_from_partial(manager._decode_map_partial(raw_map), False)[0]
+    # Editor changes the decoded map data in place
+    map_data.cleanset["1"][0] = 99
+    map_data.segments[1].neighbors.remove(2)
+
+    partial_map = manager._decode_map_partial(raw_map)
+    assert manager.partial_map_cache_hits == 1
+    map_data = DreameVacuumMapDecoder.decode_map_data_from_partial(partial_map, False)[0]
+    assert map_data.cleanset == {"1": [1, 2, 1, 0], "2": [2, 3, 1, 0]}
+    assert map_data.segments[1].neighbors == [2]
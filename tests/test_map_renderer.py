@@ -0,0 +1,22 @@
+from dreame.map import DreameVacuumMapDataRenderer, DreameVacuumMapDecoder
+from dreame.types import MapRendererLayer
+
+from map_frames import make_frame, room_pixels
+
+
+def _path_point_count(render_profile: str, map_data) -> int:
+    renderer = DreameVacuumMapDataRenderer(render_profile)
+    assert renderer.render_map(map_data)
+    return sum(len(entity["points"]) for entity in renderer._layers[MapRendererLayer.PATH])
+
+
+def test_map_data_path_is_decimated():
+    # Straight lanes with a few millimeters of jitter as the robot reports them
+    path = "M-2000,-1000" + "L20,2L20,-2" * 100 + "L0,100" + "L-20,2L-20,-2" * 100
+    raw_map = make_frame(pixels=room_pixels(60, 50), data_json={"tr": path})
+    map_data = DreameVacuumMapDecoder.decode_map(raw_map, False)[0]
+
+    raw_points = _path_point_count("High Quality", map_data)
+    decimated_points = _path_point_count("Balanced", map_data)
+    assert raw_points == 4 * len(map_data.path) - 4
+    assert 0 < decimated_points < raw_points / 10